@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    bench
+    ~~~~~
+
+    Benchmarks of the Go domain on synthetic Go API projects.
+
+    A project of ``--packages`` pages is generated, each documenting a
+    package with ``--types`` types of ``--methods`` methods, ``--functions``
+    functions and ``--xrefs`` cross-references to other packages per type.
+    With ``--versions`` the project documents that many releases of the
+    same API, each in its own directory.  It is built from scratch and
+    again after ``--touch`` of its pages changed, and for both builds the
+    wall, read, write and cross-reference resolution times, the peak
+    memory and the size of the pickled environment are reported.
+
+    ``--signatures`` instead parses the signatures of every function and
+    method in the Go sources below a directory, the standard library of
+    ``go env GOROOT`` by default.  It reports the time per signature of the
+    parser, with its caches cold and warm, and of the regex it replaced,
+    and checks that every parsed signature formats back to its source.
+
+    Builds run in their own process, offline, with the extension found in
+    ``--extension-path``, so other versions can be compared by checking
+    them out, e.g. with ``git worktree add /tmp/base <commit>`` and
+    ``--extension-path /tmp/base/sphinxcontrib``::
+
+        python bench/bench.py --packages 200 --jobs 4 --json result.json
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+CONF = """\
+import sys
+
+sys.path.insert(0, {extension_path!r})
+sys.path.insert(0, {srcdir!r})
+
+project = "Go domain benchmark"
+extensions = ["golangdomain", "benchtimer"]
+golang_profile = True
+"""
+
+# an extension noting when the phases of a build start and end
+TIMER = """\
+import json
+import os
+import resource
+import time
+
+times = {}
+
+
+def note(name):
+    def handler(app, *args):
+        times[name] = time.time()
+
+    return handler
+
+
+def finished(app, exception):
+    times["finished"] = time.time()
+    times["maxrss_kb"] = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    with open(os.path.join(app.outdir, "bench-times.json"), "w") as f:
+        json.dump(times, f)
+
+
+def setup(app):
+    app.connect("builder-inited", note("inited"))
+    app.connect("env-before-read-docs", note("read"))
+    app.connect("env-updated", note("write"))
+    app.connect("build-finished", finished)
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
+"""
+
+
+def package_page(args, rng, i, version=None):
+    """Return the reStructuredText of the page of the *i*-th package."""
+    name = "pkg%04d" % i
+    lines = [
+        name,
+        "=" * len(name),
+        "",
+        ".. go:package:: %s%s" % (args.import_prefix, name),
+        "   :synopsis: Package %s is synthetic." % name,
+    ]
+    if version is not None:
+        lines.append("   :version: %s" % version)
+    lines.append("")
+
+    def other_type():
+        package = rng.randrange(args.packages)
+        return "pkg%04d.Type%d" % (package, rng.randrange(args.types))
+
+    for t in range(args.types):
+        typ = "Type%d" % t
+        refs = ", ".join(":go:type:`%s`" % other_type() for _x in range(args.xrefs))
+        lines += [".. go:type:: %s" % typ, "", "   See %s." % (refs or typ), ""]
+        for m in range(args.methods):
+            sig = "func (t *%s) Method%d(n int, r io.Reader, o *%s) (%s, error)" % (
+                typ,
+                m,
+                other_type(),
+                typ,
+            )
+            lines += [".. go:function:: %s" % sig, "", "   Method%d does." % m, ""]
+    for f in range(args.functions):
+        sig = "func Func%d(t Type%d, others []%s) error" % (
+            f,
+            rng.randrange(args.types),
+            other_type(),
+        )
+        lines += [".. go:function:: %s" % sig, "", "   Func%d does." % f, ""]
+    return "\n".join(lines)
+
+
+def generate(args, srcdir):
+    with io.open(os.path.join(srcdir, "conf.py"), "w", encoding="utf-8") as f:
+        f.write(
+            CONF.format(
+                extension_path=os.path.abspath(args.extension_path), srcdir=srcdir
+            )
+        )
+    with io.open(os.path.join(srcdir, "benchtimer.py"), "w", encoding="utf-8") as f:
+        f.write(TIMER)
+
+    versions = [None]
+    if args.versions > 1:
+        versions = ["v%d" % n for n in range(1, args.versions + 1)]
+    names = []
+    for version in versions:
+        # the same API in every version
+        rng = random.Random(args.seed)
+        dirname = srcdir
+        if version is not None:
+            dirname = os.path.join(srcdir, version)
+            os.makedirs(dirname)
+        for i in range(args.packages):
+            name = "pkg%04d" % i
+            filename = os.path.join(dirname, name + ".rst")
+            with io.open(filename, "w", encoding="utf-8") as f:
+                f.write(package_page(args, rng, i, version) + "\n")
+            names.append(name if version is None else "%s/%s" % (version, name))
+    index = ["Go API", "======", "", ".. toctree::", ""]
+    index += ["   %s" % name for name in names]
+    with io.open(os.path.join(srcdir, "index.rst"), "w", encoding="utf-8") as f:
+        f.write("\n".join(index) + "\n")
+    return names
+
+
+def touch(args, srcdir, names):
+    """Change the text of ``--touch`` of the pages, but not their API."""
+    rng = random.Random(args.seed + 1)
+    count = int(round(len(names) * args.touch))
+    for name in rng.sample(names, count):
+        with io.open(os.path.join(srcdir, name + ".rst"), "a", encoding="utf-8") as f:
+            f.write("\nChanged at %f.\n" % time.time())
+    return count
+
+
+def build(args, srcdir, outdir, logname):
+    """Build the project and return the measurements.
+
+    Warnings go to the file *logname*.
+    """
+    cmd = [sys.executable, "-m", "sphinx", "-q", "-b", args.builder]
+    cmd += ["-j", str(args.jobs), srcdir, outdir]
+    start = time.time()
+    with io.open(logname, "wb") as log:
+        subprocess.check_call(cmd, stderr=log)
+    wall = time.time() - start
+
+    with io.open(os.path.join(outdir, "bench-times.json"), encoding="utf-8") as f:
+        times = json.load(f)
+    # nothing is read when nothing changed
+    read = times.get("read", times["inited"])
+    write = times.get("write", read)
+    result = {
+        "wall": wall,
+        "read": write - read,
+        "write": times["finished"] - write,
+        "peak_memory_mb": times["maxrss_kb"] / 1024.0,
+    }
+    # only available from versions with golang_profile
+    profile = os.path.join(outdir, "golang-profile.json")
+    if os.path.exists(profile):
+        with io.open(profile, encoding="utf-8") as f:
+            timers = json.load(f)["timers"]
+        result["resolve"] = timers.get("resolve_xref", {}).get("seconds", 0.0)
+        os.remove(profile)
+    pickle = os.path.join(outdir, ".doctrees", "environment.pickle")
+    result["pickle_kb"] = os.path.getsize(pickle) / 1024.0
+    return result
+
+
+def report(results):
+    columns = ["wall", "read", "write", "resolve", "peak_memory_mb", "pickle_kb"]
+    print("%-12s" % "build" + "".join("%16s" % column for column in columns))
+    for name, result in results:
+        values = "".join(
+            "%16.3f" % result[column] if column in result else "%16s" % "-"
+            for column in columns
+        )
+        print("%-12s" % name + values)
+
+
+# the regex the signature parser replaced, the baseline of --signatures
+BASELINE_RE = re.compile(
+    r"""^\s* func \s*
+         (?: \((.*)\) )? \s*
+         ([\w.]+)
+         \( ([\w\s\[\](){},.*]*) \) \s*
+         ([\w\s\[\](){},.*]*) \s* $
+    """,
+    re.VERBOSE,
+)
+
+
+def baseline_parse(sig):
+    """Parse *sig* as the code using BASELINE_RE did."""
+    m = BASELINE_RE.match(sig)
+    if m is None:
+        return None
+    receiver, name, arglist, results = m.groups()
+    if receiver:
+        try:
+            arg, typ = receiver.split(" ", 1)
+        except ValueError:
+            arg, typ = None, receiver
+        receiver = (arg, typ)
+    params = []
+    if arglist:
+        for arg in arglist.split(","):
+            arg = arg.strip()
+            try:
+                argname, gotype = arg.split(" ", 1)
+            except ValueError:
+                argname, gotype = None, arg
+            params.append((argname, gotype))
+    return receiver, name, tuple(params), results
+
+
+def collect_signatures(root, source):
+    """Return the signatures of the Go sources below *root*, tests and
+    test data excluded, in the order the files are found.
+    """
+    sigs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            name for name in dirnames if name != "testdata" and name[0] not in "._"
+        )
+        for name in sorted(filenames):
+            if name.endswith(".go") and not name.endswith("_test.go"):
+                filename = os.path.join(dirpath, name)
+                with io.open(filename, encoding="utf-8", errors="replace") as f:
+                    sigs.extend(source.func_signatures(f.read()))
+    return sigs
+
+
+def format_signature(signature, func):
+    """Format the parsed *func* back into the source of a signature."""
+    text = "func "
+    if func.receiver is not None:
+        text += "(%s) " % signature.format_params((func.receiver,))
+    text += func.name
+    if func.type_params:
+        text += "[%s]" % signature.format_params(func.type_params)
+    text += "(%s)" % signature.format_params(func.params)
+    results = signature.format_results(func.results)
+    return text + (" " + results if results else "")
+
+
+def _normalized(sig):
+    return re.sub(r",([)\]])", r"\1", "".join(sig.split()))
+
+
+def _timed(function, sigs):
+    # without the collector, as timeit does: in a process this small the
+    # parsed signatures kept in the caches set off full collections, which
+    # they do not in a build, with its doctrees around
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for sig in sigs:
+            try:
+                function(sig)
+            except ValueError:
+                pass
+        return (time.perf_counter() - start) / len(sigs) * 1e6
+    finally:
+        gc.enable()
+
+
+def bench_signatures(args):
+    sys.path.insert(0, os.path.abspath(args.extension_path))
+    from golangdomain import signature, source
+
+    root = args.signatures
+    if not root:
+        goroot = subprocess.check_output(["go", "env", "GOROOT"])
+        root = os.path.join(goroot.decode().strip(), "src")
+    sigs = collect_signatures(root, source)
+
+    failures = []
+    mismatches = []
+    types = set()
+    for sig in sigs:
+        try:
+            func = signature.parse_function(sig)
+        except signature.SignatureError:
+            failures.append(sig)
+            continue
+        if _normalized(format_signature(signature, func)) != _normalized(sig):
+            mismatches.append(sig)
+        for param in func.params + func.results:
+            types.add(param.type)
+    for typ in types:
+        if "".join(text for text, _name in signature.tokenize_type(typ)) != typ:
+            mismatches.append(typ)
+
+    # the best of interleaved rounds, as other processes get in the way
+    cold, warm, baseline = [], [], []
+    for _x in range(5):
+        for name in dir(signature):
+            cache_clear = getattr(getattr(signature, name), "cache_clear", None)
+            if cache_clear is not None:
+                cache_clear()
+        cold.append(_timed(signature.parse_function, sigs))
+        warm.append(_timed(signature.parse_function, sigs))
+        baseline.append(_timed(baseline_parse, sigs))
+    results = {
+        "signatures": len(sigs),
+        "distinct": len(set(sigs)),
+        "parser_cold_us": min(cold),
+        "parser_warm_us": min(warm),
+        "baseline_us": min(baseline),
+        "parser_failures": len(failures),
+        "baseline_failures": sum(1 for sig in sigs if baseline_parse(sig) is None),
+        "mismatches": len(mismatches),
+    }
+
+    print(
+        "%d signatures, %d distinct, from %s"
+        % (results["signatures"], results["distinct"], root)
+    )
+    print(
+        "per signature: parser %.2f us cold, %.2f us warm; baseline regex %.2f us"
+        % (
+            results["parser_cold_us"],
+            results["parser_warm_us"],
+            results["baseline_us"],
+        )
+    )
+    print(
+        "not parsed: parser %d, baseline regex %d; not formatting back: %d"
+        % (
+            results["parser_failures"],
+            results["baseline_failures"],
+            results["mismatches"],
+        )
+    )
+    for sig in (failures + mismatches)[:10]:
+        print("  %s" % sig)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--packages", type=int, default=100)
+    parser.add_argument("--types", type=int, default=10)
+    parser.add_argument("--methods", type=int, default=5)
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--xrefs", type=int, default=3, help="per type")
+    parser.add_argument("--versions", type=int, default=1)
+    parser.add_argument("--import-prefix", default="github.com/bench/")
+    parser.add_argument("--touch", type=float, default=0.1, help="fraction of pages")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--builder", default="html")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--extension-path",
+        default=os.path.join(here, os.pardir, "sphinxcontrib"),
+        help="the directory containing golangdomain",
+    )
+    parser.add_argument("--workdir", help="kept after the run if given")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument(
+        "--signatures",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="benchmark the signature parser on the Go sources in DIR",
+    )
+    args = parser.parse_args(argv)
+
+    if args.signatures is not None:
+        results = bench_signatures(args)
+        if args.json:
+            with io.open(args.json, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"signatures": results}, indent=2, sort_keys=True))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="golangdomain-bench-")
+    srcdir = os.path.join(workdir, "src")
+    outdir = os.path.join(workdir, "out")
+    try:
+        for dirname in (srcdir, outdir):
+            if os.path.exists(dirname):
+                shutil.rmtree(dirname)
+        os.makedirs(srcdir)
+        names = generate(args, srcdir)
+        results = []
+        for name in ("full", "incremental"):
+            if name == "incremental":
+                touched = touch(args, srcdir, names)
+            logname = os.path.join(workdir, name + ".log")
+            results.append((name, build(args, srcdir, outdir, logname)))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir)
+
+    symbols = args.packages * (1 + args.types * (1 + args.methods) + args.functions)
+    print(
+        "%d packages, %d symbols, %d versions, "
+        "%d pages changed for the incremental build"
+        % (args.packages, symbols, args.versions, touched)
+    )
+    report(results)
+    if args.json:
+        with io.open(args.json, "w", encoding="utf-8") as f:
+            f.write(
+                json.dumps(
+                    {"arguments": vars(args), "results": dict(results)},
+                    indent=2,
+                    sort_keys=True,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,10 @@ long_desc = """
 This package contains the sphinxcontrib-golangdomain Sphinx extension.
 
 This extension adds golang Domain to Sphinx.
-It needs Sphinx 1.0 or newer.
+It needs Sphinx 3.4 or newer.
 """
 
-requires = ["Sphinx>=1.0"]
+requires = ["Sphinx>=3.4"]
 
 setup(
     name="sphinxcontrib-golangdomain",
@@ -36,6 +36,7 @@ setup(
     platforms="any",
     packages=find_packages(),
     include_package_data=True,
+    package_data={"sphinxcontrib.golangdomain": ["static/*.js"]},
     install_requires=requires,
     namespace_packages=["sphinxcontrib"],
 )
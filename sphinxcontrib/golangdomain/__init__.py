@@ -0,0 +1,2273 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    The Go language domain.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import bisect
+import collections
+import functools
+import io
+import itertools
+import os
+import re
+
+from docutils import nodes
+from docutils.parsers.rst import directives, Directive
+
+from sphinx import addnodes
+from sphinx.roles import XRefRole
+from sphinx.locale import _
+
+from sphinx.directives import ObjectDescription
+from sphinx.domains import Domain, ObjType, Index
+from sphinx.util import logging
+from sphinx.util.nodes import make_refnode
+from sphinx.util.docfields import Field, TypedField
+
+from .conflicts import definition_key, report_conflicts
+from .export import write_export
+from .nitpick import init_missing, note_missing_reference, report_missing
+from .profiling import (
+    get_profile,
+    init_profile,
+    merge_profile,
+    profiled,
+    write_profile,
+)
+from .reuse import ANY, find_moved_references, note_document, skip_unchanged
+from .search import init_search_index, write_search_index
+from .signature import (
+    format_params,
+    format_results,
+    is_function,
+    parse_function,
+    parse_type_params,
+    split_type_args,
+    strip_type_args,
+    tokenize_type,
+    type_params_end,
+)
+from .source import package_dirs, package_files, package_records, scan_files
+from .symbols import doc_to_nodes, iter_records, kinds
+
+
+logger = logging.getLogger(__name__)
+
+#: How many versions' lookup tables are kept, see GolangDomain._get_lookup().
+VERSION_LOOKUPS = 2
+
+
+# REs for Golang signatures
+go_sig_re = re.compile(
+    r"""^(?:(?:type|var|const)\s+)? # the keyword, if any
+         (\w+(?:\.\w+)?)            # thing name
+    """,
+    re.VERBOSE,
+)
+
+go_field_re = re.compile(
+    r"""^([^\W\d]\w*(?:\.[^\W\d]\w*)?) # field name, maybe after the type's
+         \s+ ([^\s"`].*)$          # field type and tag
+    """,
+    re.VERBOSE,
+)
+
+go_func_split_re = re.compile(
+    r"""^\( (.*) \) \s*            # struct/interface name
+         ([\w.]+)                  # function name
+    """,
+    re.VERBOSE,
+)
+
+
+#: A parsed Go signature.  ``receiver`` is a :class:`~.signature.Param`
+#: for methods; ``type_params``, ``params`` and ``results`` are tuples of
+#: them, with ``params`` None for everything but functions.
+GolangSignature = collections.namedtuple(
+    "GolangSignature",
+    [
+        "package",
+        "receiver",
+        "prefix",
+        "name",
+        "type_params",
+        "params",
+        "results",
+        "fullname",
+    ],
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_signature(sig, env_pkgname):
+    """Parse the signature *sig* of an object documented in *env_pkgname*.
+
+    Returns a :class:`GolangSignature` and raises ValueError if *sig* is
+    not understood.  Generated API docs repeat the same signatures over and
+    over, so the results are kept in a bounded LRU cache.
+    """
+    if is_function(sig):
+        return _parse_function_signature(parse_function(sig), env_pkgname)
+
+    m = go_sig_re.match(sig)
+    if m is None:
+        raise ValueError
+    type_params = ()
+    if sig[m.end() : m.end() + 1] == "[":
+        # a generic type, "List[T any]"
+        end = type_params_end(sig, m.end())
+        type_params = parse_type_params(sig[m.end() : end])
+    return _parse_general_signature(m, type_params, env_pkgname)
+
+
+def _parse_general_signature(m, type_params, env_pkgname):
+    (name,) = m.groups()
+    if "." in name:
+        pkgname, name = name.split(".", 1)
+        return GolangSignature(
+            pkgname, None, pkgname + ".", name, type_params, None, (), m.group(1)
+        )
+    fullname = "%s.%s" % (env_pkgname, name)
+    return GolangSignature(env_pkgname, None, "", name, type_params, None, (), fullname)
+
+
+def _parse_function_signature(func, env_pkgname):
+    prefix = ""
+    name = func.name
+    if func.receiver:
+        # keep pointer receivers apart: "(pkg.*T) Name"; the methods of
+        # generic types are known by the type's name, "(pkg.*List) Push"
+        receiver = split_type_args(func.receiver.type)[0]
+        typ = receiver.lstrip("*")
+        stars = receiver[: -len(typ)]
+        pkgname, _dot, typename = typ.rpartition(".")
+        pkgname = pkgname or env_pkgname
+        fullname = "(%s.%s%s) %s" % (pkgname, stars, typename, name)
+    else:
+        pkgname, _dot, name = name.rpartition(".")
+        if pkgname:
+            prefix = pkgname + "."
+        else:
+            pkgname = env_pkgname
+        fullname = "%s.%s" % (pkgname, name)
+
+    return GolangSignature(
+        pkgname,
+        func.receiver,
+        prefix,
+        name,
+        func.type_params,
+        func.params,
+        func.results,
+        fullname,
+    )
+
+
+class GolangObject(ObjectDescription):
+    """
+    Description of a Golang language object.
+    """
+
+    doc_field_types = [
+        TypedField(
+            "parameter",
+            label=_("Parameters"),
+            names=("param", "parameter", "arg", "argument"),
+            typerolename="type",
+            typenames=("type",),
+        ),
+        Field(
+            "returnvalue",
+            label=_("Returns"),
+            has_arg=False,
+            names=("returns", "return"),
+        ),
+        Field("returntype", label=_("Return type"), has_arg=False, names=("rtype",)),
+    ]
+
+    # Go's predeclared types and keywords are never cross-referenced, see
+    # tokenize_type(); neither are these names
+    stopwords = set()
+
+    @profiled("handle_signature", per_signature=True)
+    def handle_signature(self, sig, signode):
+        # default package is 'builtin'
+        env_pkgname = self.options.get(
+            "package", self.env.temp_data.get("go:package", "builtin")
+        )
+        parsed = parse_signature(sig, env_pkgname)
+        # for the members of a type nested in its description
+        self.type_params = frozenset(
+            name for param in parsed.type_params for name in param.names
+        )
+        if parsed.params is None:
+            self._handle_general_signature(signode, parsed)
+        else:
+            self._handle_function_signature(signode, parsed)
+        return parsed.fullname
+
+    def before_content(self):
+        if self.objtype == "type" and self.names:
+            # fields and interface methods nested in the description of a
+            # type belong to it
+            types = self.env.temp_data.setdefault("go:types", [])
+            types.append((self.names[-1], self.type_params))
+
+    def after_content(self):
+        if self.objtype == "type" and self.names:
+            self.env.temp_data["go:types"].pop()
+
+    def _handle_general_signature(self, signode, parsed):
+        if parsed.prefix:
+            signode += addnodes.desc_addname(parsed.prefix, parsed.prefix)
+        signode += addnodes.desc_name(parsed.name, parsed.name)
+        if parsed.type_params:
+            type_params = "[%s]" % format_params(parsed.type_params)
+            signode += addnodes.desc_addname(type_params, type_params)
+
+    @profiled("_parse_type")
+    def _parse_type(self, node, gotype, type_params=()):
+        # add cross-ref nodes for the type names, except for type parameters
+        pkgname = self.env.temp_data.get("go:package")
+        for text, name in tokenize_type(gotype):
+            tnode = nodes.Text(text, text)
+            if name is None or name in self.stopwords or name in type_params:
+                node += tnode
+                continue
+            pnode = addnodes.pending_xref(
+                "",
+                refdomain="go",
+                reftype="type",
+                reftarget=name,
+                modname=None,
+                classname=None,
+            )
+            pnode["go:package"] = pkgname
+            pnode["go:version"] = self.env.temp_data.get("go:version")
+            pnode += tnode
+            node += pnode
+
+    def _handle_function_signature(self, signode, parsed):
+        signode += addnodes.desc_addname("func ", "func" + u"\xa0")
+        if parsed.receiver:
+            signode += addnodes.desc_addname("(", "(")
+            for arg in parsed.receiver.names:
+                signode += addnodes.desc_addname(arg + " ", arg + u"\xa0")
+            typ = parsed.receiver.type
+            signode += addnodes.desc_name(typ, typ)
+            signode += addnodes.desc_addname(") ", ")" + u"\xa0")
+        elif parsed.prefix:
+            signode += addnodes.desc_name(parsed.prefix, parsed.prefix)
+        signode["package"] = parsed.package
+        signode += addnodes.desc_name(parsed.name, parsed.name)
+
+        type_params = set(self.type_params)
+        if parsed.receiver:
+            # the type parameters of a generic receiver, "*List[K, V]"
+            type_params.update(split_type_args(parsed.receiver.type)[1])
+        self._handle_parameters(signode, parsed, type_params)
+
+    def _handle_parameters(self, signode, parsed, type_params):
+        if parsed.type_params:
+            text = "[%s]" % format_params(parsed.type_params)
+            signode += addnodes.desc_addname(text, text)
+
+        paramlist = addnodes.desc_parameterlist()
+        for param in parsed.params:
+            node = addnodes.desc_parameter("", "", noemph=True)
+            if param.names:
+                # separate by non-breaking space in the output
+                argnames = ", ".join(param.names)
+                node += nodes.emphasis(argnames + " ", argnames + u"\xa0")
+            self._parse_type(node, param.type, type_params)
+            paramlist += node
+        # for callables without arguments this is an empty parameter list
+        signode += paramlist
+
+        if parsed.results:
+            results = format_results(parsed.results)
+            signode += addnodes.desc_returns(results, results)
+
+    def _get_index_text(self, name):
+        if self.objtype == "function":
+            return _("%s (Golang function)") % name
+        elif self.objtype == "variable":
+            return _("%s (Golang variable)") % name
+        elif self.objtype == "const":
+            return _("%s (Golang const)") % name
+        elif self.objtype == "type":
+            return _("%s (Golang type)") % name
+        elif self.objtype == "method":
+            return _("%s (Golang method)") % name
+        elif self.objtype == "field":
+            return _("%s (Golang field)") % name
+        elif self.objtype == "interfacemethod":
+            return _("%s (Golang interface method)") % name
+        else:
+            return ""
+
+    @profiled("add_target_and_index")
+    def add_target_and_index(self, name, sig, signode):
+        # descriptions of the same name, in this document or elsewhere, are
+        # reported at the end of the reading, see report_conflicts()
+        self.env.get_domain("go").note_object(
+            name,
+            self.objtype,
+            self.env.docname,
+            self.lineno,
+            self.env.temp_data.get("go:version"),
+        )
+        if name not in self.state.document.ids:
+            signode["names"].append(name)
+            signode["ids"].append(name)
+            signode["first"] = not self.names
+            self.state.document.note_explicit_target(signode)
+
+        indextext = self._get_index_text(name)
+        if indextext:
+            self.indexnode["entries"].append(("single", indextext, name, "", None))
+
+
+class GolangMember(GolangObject):
+    """
+    Description of a struct field or interface method, nested in the
+    description of its type or qualified with the type's name, as in
+    ``Buffer.Len() int``.  Fields without a name are embedded.
+    """
+
+    @profiled("handle_signature", per_signature=True)
+    def handle_signature(self, sig, signode):
+        env_pkgname = self.options.get(
+            "package", self.env.temp_data.get("go:package", "builtin")
+        )
+        types = self.env.temp_data.get("go:types")
+        typename, type_params = types[-1] if types else (None, frozenset())
+        self.type_params = type_params
+        self.embedded = None
+
+        sig = sig.strip()
+        if self.objtype == "interfacemethod":
+            parsed = parse_signature("func " + sig, env_pkgname)
+            name = parsed.name
+            qualifier = parsed.prefix[:-1]
+        else:
+            m = go_field_re.match(sig)
+            if m is not None:
+                name, typ = m.groups()
+                qualifier, _dot, name = name.rpartition(".")
+            else:
+                # an embedded field is named after its type
+                typ = sig.split(None, 1)[0]
+                name = strip_type_args(typ.lstrip("*")).rpartition(".")[2]
+                qualifier = ""
+                self.embedded = typ
+        if qualifier:
+            typename = "%s.%s" % (env_pkgname, qualifier)
+            signode += addnodes.desc_addname(qualifier + ".", qualifier + ".")
+        elif typename is None:
+            raise ValueError("%s outside of a type" % self.objtype)
+
+        if self.objtype == "interfacemethod":
+            signode += addnodes.desc_name(name, name)
+            self._handle_parameters(signode, parsed, type_params)
+        elif self.embedded:
+            namenode = addnodes.desc_name()
+            self._parse_type(namenode, sig, type_params)
+            signode += namenode
+        else:
+            signode += addnodes.desc_name(name, name)
+            typenode = addnodes.desc_type()
+            self._parse_type(typenode, typ, type_params)
+            signode += nodes.Text(" ")
+            signode += typenode
+        return "%s.%s" % (typename, name)
+
+    def add_target_and_index(self, name, sig, signode):
+        super(GolangMember, self).add_target_and_index(name, sig, signode)
+        if self.embedded and name in signode["ids"]:
+            pkgname = self.env.temp_data.get("go:package")
+            version = self.env.temp_data.get("go:version")
+            domain = self.env.get_domain("go")
+            domain.note_embedded(name, pkgname, self.embedded, version)
+
+
+class GolangPackage(Directive):
+    """
+    Directive to mark description of a new package, of the release given
+    by ``:version:`` if any, as are the objects described after it.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = False
+    option_spec = {
+        "platform": lambda x: x,
+        "synopsis": lambda x: x,
+        "noindex": directives.flag,
+        "deprecated": directives.flag,
+        "version": directives.unchanged_required,
+    }
+
+    def run(self):
+        env = self.state.document.settings.env
+        pkgname = self.arguments[0].strip()
+        noindex = "noindex" in self.options
+        version = self.options.get("version")
+        env.temp_data["go:package"] = pkgname
+        env.temp_data["go:version"] = version
+        env.get_domain("go").note_package(
+            pkgname,
+            (
+                env.docname,
+                self.options.get("synopsis", ""),
+                self.options.get("platform", ""),
+                "deprecated" in self.options,
+            ),
+            version,
+            self.lineno,
+        )
+        targetnode = nodes.target("", "", ids=["package-" + pkgname], ismod=True)
+        self.state.document.note_explicit_target(targetnode)
+        ret = [targetnode]
+        # XXX this behavior of the package directive is a mess...
+        if "platform" in self.options:
+            platform = self.options["platform"]
+            node = nodes.paragraph()
+            node += nodes.emphasis("", _("Platforms: "))
+            node += nodes.Text(platform, platform)
+            ret.append(node)
+        # the synopsis isn't printed; in fact, it is only used in the
+        # pkgindex currently
+        if not noindex:
+            indextext = _("%s (package)") % pkgname
+            inode = addnodes.index(
+                entries=[("single", indextext, "package-" + pkgname, "", None)]
+            )
+            # for the report of conflicts to find the package
+            inode.line = self.lineno
+            ret.append(inode)
+        return ret
+
+
+class GolangSymbols(GolangObject):
+    """
+    Directive to describe every Go symbol in a JSON dump, see
+    :mod:`sphinxcontrib.golangdomain.symbols` for the format.
+
+    Records are streamed from the file and turned into nodes directly,
+    without generating reStructuredText to parse.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = True
+    option_spec = {
+        "noindex": directives.flag,
+        "version": directives.unchanged_required,
+    }
+
+    def run(self):
+        env = self.state.document.settings.env
+        rel_filename, filename = env.relfn2path(self.arguments[0])
+        env.note_dependency(rel_filename)
+        try:
+            with io.open(filename, encoding="utf-8") as f:
+                return self._run_records(env, iter_records(f), filename)
+        except (IOError, ValueError) as exc:
+            return [self._read_error(filename, exc)]
+
+    def _read_error(self, filename, exc):
+        msg = "Error reading Go symbols from %s: %s" % (filename, exc)
+        return self.state.document.reporter.warning(msg, line=self.lineno)
+
+    def _run_records(self, env, records, filename=None):
+        current = env.temp_data.get("go:package")
+        current_version = env.temp_data.get("go:version")
+        env.temp_data["go:version"] = self.options.get("version", current_version)
+        ret = []
+        try:
+            for number, record in enumerate(records, 1):
+                # a record may be any JSON value, not just an object
+                kind = record.get("kind") if isinstance(record, dict) else None
+                if (
+                    not isinstance(kind, str)
+                    or kind not in kinds
+                    or "name" not in record
+                ):
+                    logger.warning(
+                        _("invalid Go symbol record %d: %r"),
+                        number,
+                        record,
+                        location=(env.docname, self.lineno),
+                    )
+                    continue
+                env.temp_data["go:package"] = record.get("package", current)
+                ret.extend(self._run_record(env, record))
+        except (IOError, ValueError) as exc:
+            # keep the nodes of the records read so far, they are in the
+            # domain data already
+            ret.append(self._read_error(filename, exc))
+        finally:
+            env.temp_data["go:package"] = current
+            env.temp_data["go:version"] = current_version
+        return ret
+
+    def _run_record(self, env, record):
+        objtype = kinds[record["kind"]]
+        noindex = "noindex" in self.options
+
+        if objtype == "package":
+            pkgname = record["name"]
+            env.get_domain("go").note_package(
+                pkgname,
+                (env.docname, record.get("synopsis", ""), "", False),
+                env.temp_data.get("go:version"),
+            )
+            targetnode = nodes.target("", "", ids=["package-" + pkgname], ismod=True)
+            self.state.document.note_explicit_target(targetnode)
+            ret = [targetnode]
+            if not noindex:
+                indextext = _("%s (package)") % pkgname
+                ret.append(
+                    addnodes.index(
+                        entries=[("single", indextext, "package-" + pkgname, "", None)]
+                    )
+                )
+            return ret + doc_to_nodes(record.get("doc", ""))
+
+        # the parts of ObjectDescription.run() that apply to a record
+        self.objtype = objtype
+        self.names = []
+        self.indexnode = addnodes.index(entries=[])
+        node = addnodes.desc()
+        node.document = self.state.document
+        node["domain"] = "go"
+        node["objtype"] = node["desctype"] = objtype
+        node["noindex"] = noindex
+
+        sig = record.get("signature") or record["name"]
+        signode = addnodes.desc_signature(sig, "")
+        node += signode
+        try:
+            name = self.handle_signature(sig, signode)
+        except ValueError:
+            signode.clear()
+            signode += addnodes.desc_name(sig, sig)
+        else:
+            self.names.append(name)
+            if not noindex:
+                self.add_target_and_index(name, sig, signode)
+        contentnode = addnodes.desc_content()
+        if record.get("decl"):
+            contentnode += nodes.literal_block(record["decl"], record["decl"])
+        contentnode.extend(doc_to_nodes(record.get("doc", "")))
+        node += contentnode
+        return [self.indexnode, node]
+
+
+class GolangAutoPackage(GolangSymbols):
+    """
+    Directive to describe the exported API of the Go package in a directory,
+    or with ``:recursive:`` of all packages below it, extracted from their
+    source files.  ``golang_source_workers`` processes scan the files.
+
+    Scan results are cached in the doctree directory, so unchanged files
+    are not scanned again, and the files are dependencies of the document.
+    """
+
+    option_spec = {
+        "import-path": directives.unchanged,
+        "recursive": directives.flag,
+        "noindex": directives.flag,
+        "version": directives.unchanged_required,
+    }
+
+    def run(self):
+        env = self.state.document.settings.env
+        rel_dirname, dirname = env.relfn2path(self.arguments[0])
+        import_path = self.options.get("import-path")
+        workers = env.config.golang_source_workers or os.cpu_count() or 1
+        try:
+            if "recursive" in self.options:
+                dirnames = package_dirs(dirname)
+            else:
+                dirnames = [dirname]
+            packages = [package_files(pkgdir) for pkgdir in dirnames]
+            # scan the files of all packages at once, so a pool of workers
+            # is kept busy even for many small packages
+            filenames = [filename for files in packages for filename in files]
+            cachedir = os.path.join(env.doctreedir, "golang")
+            results = scan_files(filenames, cachedir, workers)
+        except (IOError, OSError) as exc:
+            msg = "Error reading Go package %s: %s" % (dirname, exc)
+            return [self.state.document.reporter.warning(msg, line=self.lineno)]
+
+        for filename in filenames:
+            env.note_dependency(filename)
+        records = []
+        end = 0
+        for pkgdir, files in zip(dirnames, packages):
+            start, end = end, end + len(files)
+            pkg_results = results[start:end]
+            pkg_import_path = import_path
+            if import_path and pkgdir != dirname:
+                relpath = os.path.relpath(pkgdir, dirname).replace(os.sep, "/")
+                pkg_import_path = "%s/%s" % (import_path, relpath)
+            records.extend(package_records(pkg_results, pkg_import_path))
+        return self._run_records(env, records, dirname)
+
+
+class GolangCurrentPackage(Directive):
+    """
+    This directive is just to tell Sphinx that we're documenting
+    stuff in package foo, but links to package foo won't lead here.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = False
+    option_spec = {}
+
+    def run(self):
+        env = self.state.document.settings.env
+        pkgname = self.arguments[0].strip()
+        if pkgname == "None":
+            env.temp_data["go:package"] = None
+        else:
+            env.temp_data["go:package"] = pkgname
+        return []
+
+
+class methodset(nodes.General, nodes.Element):
+    """Placeholder for the method set of a type, see :func:`process_methodsets`."""
+
+
+class GolangMethodSet(Directive):
+    """
+    Directive to list the method set of a type, or with ``*T`` of its
+    pointer type, methods promoted from its embedded fields included.
+    The list is filled in once all documents are read.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = False
+    option_spec = {}
+
+    def run(self):
+        env = self.state.document.settings.env
+        node = methodset("", reftarget=self.arguments[0].strip())
+        node["go:package"] = env.temp_data.get("go:package")
+        node["go:version"] = env.temp_data.get("go:version")
+        # the method set depends on other types and their documents
+        env.get_domain("go").note_references(env.docname, (ANY,))
+        node.source, node.line = self.state_machine.get_source_and_line(self.lineno)
+        return [node]
+
+
+class GolangXRefRole(XRefRole):
+    def process_link(self, env, refnode, has_explicit_title, title, target):
+        refnode["go:package"] = env.temp_data.get("go:package")
+        refnode["go:version"] = env.temp_data.get("go:version")
+        if not has_explicit_title:
+            title = title.lstrip(".")  # only has a meaning for the target
+            target = target.lstrip("~")  # only has a meaning for the title
+            # if the first character is a tilde, don't display the package
+            # parts of the contents
+            if title[0:1] == "~":
+                title = title[1:]
+                colon = title.rfind(".")
+                if colon != -1:
+                    title = title[colon + 1 :]
+        return title, target
+
+
+def package_root(pkgname):
+    """Return the top-level package of *pkgname*.
+
+    Import paths like ``github.com/acme/foo`` are split on slashes, other
+    names on dots.
+    """
+    return pkgname.split("/" if "/" in pkgname else ".", 1)[0]
+
+
+class GolangIndex(Index):
+    """
+    Base class of the Golang indices, which are generated once per builder
+    and output format but only change with the inventories they are built
+    from, so their content is cached until then.
+    """
+
+    #: The inventories the index is generated from.
+    inventories = ("objects", "functions", "methods", "packages")
+
+    @profiled("generate_index")
+    def generate(self, docnames=None):
+        key = frozenset(docnames) if docnames else None
+        cache = self.domain._get_index_cache(self)
+        if key not in cache:
+            cache[key] = self._generate(docnames)
+        return cache[key]
+
+    @property
+    def env(self):
+        # for profiled()
+        return self.domain.env
+
+    def _generate(self, docnames):
+        raise NotImplementedError
+
+
+class GolangPackageIndex(GolangIndex):
+    """
+    Index subclass to provide the Golang package index.
+    """
+
+    name = "pkgindex"
+    localname = _("Golang Package Index")
+    shortname = _("packages")
+    inventories = ("packages",)
+
+    def _generate(self, docnames):
+        content = {}
+        # prefixes to ignore, looked up by length, longest first
+        ignores = set(self.domain.env.config["modindex_common_prefix"])
+        lengths = sorted(set(len(ignore) for ignore in ignores), reverse=True)
+        # list of all packages, sorted by package name
+        packages = self.domain.get_sorted_packages()
+        # sort out collapsable packages
+        prev_package = None
+        num_toplevels = 0
+        for pkgname in packages:
+            docname, synopsis, platforms, deprecated = self.domain.get_entry(
+                "packages", pkgname
+            )
+            if docnames and docname not in docnames:
+                continue
+
+            for length in lengths:
+                if pkgname[:length] in ignores:
+                    stripped = pkgname[:length]
+                    pkgname = pkgname[length:]
+                    break
+            else:
+                stripped = ""
+
+            # we stripped the whole package name?
+            if not pkgname:
+                pkgname, stripped = stripped, ""
+
+            entries = content.setdefault(pkgname[0].lower(), [])
+
+            package = package_root(pkgname)
+            if package != pkgname:
+                # it's a subpackage
+                if prev_package == (stripped, package, package):
+                    # first subpackage - make parent a group head
+                    entries[-1][1] = 1
+                elif prev_package is None or prev_package[:2] != (stripped, package):
+                    # subpackage without parent in list, add dummy entry
+                    entries.append([stripped + package, 1, "", "", "", "", ""])
+                subtype = 2
+            else:
+                num_toplevels += 1
+                subtype = 0
+
+            qualifier = deprecated and _("Deprecated") or ""
+            entries.append(
+                [
+                    stripped + pkgname,
+                    subtype,
+                    docname,
+                    "package-" + stripped + pkgname,
+                    platforms,
+                    qualifier,
+                    synopsis,
+                ]
+            )
+            prev_package = (stripped, package, pkgname)
+
+        # apply heuristics when to collapse pkgindex at page load:
+        # only collapse if number of toplevel packages is larger than
+        # number of subpackages
+        collapse = len(packages) - num_toplevels < num_toplevels
+
+        # sort by first letter
+        content = sorted(content.items())
+
+        return content, collapse
+
+
+class GolangSymbolIndex(GolangIndex):
+    """
+    Index subclass listing the symbols of every package like godoc does:
+    constants, variables, functions and types, each followed by its
+    methods.
+    """
+
+    name = "symindex"
+    localname = _("Golang Symbol Index")
+    shortname = _("symbols")
+
+    # godoc's order of the sections of a package
+    sections = ("const", "var", "function", "type")
+    # the objtypes listed under their type
+    member_labels = {
+        "function": "method",
+        "method": "method",
+        "field": "field",
+        "interfacemethod": "interface method",
+    }
+
+    def _generate(self, docnames):
+        # group everything in one pass: package -> section -> entries, and
+        # package -> type name -> methods
+        packages = {}
+        methods = {}
+        for invname in ("functions", "objects", "methods"):
+            for fullname, entry in self.domain.iter_entries(invname):
+                docname, objtype = entry[:2]
+                if docnames and docname not in docnames:
+                    continue
+                if invname == "methods" or objtype in member_objtypes:
+                    # "(pkg.*T) Name" is listed as "(*T) Name" under "T",
+                    # "pkg.T.Name" as "T.Name"
+                    if invname == "methods":
+                        pkgname, typename, name, pointer = split_method(fullname)
+                        stars = "*" if pointer else ""
+                        name = "(%s%s) %s" % (stars, typename, name)
+                    else:
+                        pkgname, _dot, name = fullname.rpartition(".")
+                        pkgname, _dot, typename = pkgname.rpartition(".")
+                        name = "%s.%s" % (typename, name)
+                    packages.setdefault(pkgname, {})
+                    bytype = methods.setdefault(pkgname, {})
+                    member = (name, docname, fullname, objtype)
+                    bytype.setdefault(typename, []).append(member)
+                    continue
+                pkgname, _dot, name = fullname.rpartition(".")
+                section = objtype if objtype in self.sections else "function"
+                sections = packages.setdefault(pkgname, {})
+                sections.setdefault(section, []).append((name, docname, fullname))
+
+        content = []
+        for pkgname in sorted(packages, key=lambda name: (name.lower(), name)):
+            sections = packages[pkgname]
+            bytype = methods.get(pkgname, {})
+            # types only known from their methods get a dummy entry
+            types = sections.setdefault("type", [])
+            known = set(name for name, _docname, _fullname in types)
+            types.extend((name, "", "") for name in bytype if name not in known)
+
+            entries = []
+            for section in self.sections:
+                for name, docname, fullname in sorted(sections.get(section, ())):
+                    typemethods = bytype.get(name, ()) if section == "type" else ()
+                    subtype = 1 if typemethods else 0
+                    extra = section if docname else ""
+                    entries.append([name, subtype, docname, fullname, extra, "", ""])
+                    for member in sorted(typemethods):
+                        method, docname, fullname, objtype = member
+                        extra = self.member_labels[objtype]
+                        entries.append([method, 2, docname, fullname, extra, "", ""])
+            content.append((pkgname, entries))
+
+        return content, False
+
+
+def name_keys(fullname):
+    """Return the spellings of *fullname* that references may use.
+
+    These are ``Reader``, ``io.Reader`` and ``acme/io.Reader`` for the
+    fullname ``acme/io.Reader``.
+    """
+    pkgname, _dot, name = fullname.rpartition(".")
+    path = pkgname.split("/")
+    return [name] + ["%s.%s" % ("/".join(path[i:]), name) for i in range(len(path))]
+
+
+def member_keys(fullname):
+    """Return the spellings of the member *fullname* that references may use.
+
+    These are ``Len``, ``Buffer.Len``, ``bytes.Buffer.Len`` and so on for
+    the fullname ``bytes.Buffer.Len``, see :func:`name_keys`.
+    """
+    typename, _dot, name = fullname.rpartition(".")
+    return [name] + ["%s.%s" % (key, name) for key in name_keys(typename)]
+
+
+@functools.lru_cache(maxsize=4096)
+def split_method(fullname):
+    """Split the method fullname ``(pkg.*T) Name`` into its parts.
+
+    Returns ``(pkgname, typename, name, pointer)``, or None if *fullname*
+    is not the fullname of a method.
+    """
+    m = go_func_split_re.match(fullname)
+    if m is None:
+        return None
+    typ, name = m.groups()
+    pkgname, _dot, typename = typ.rpartition(".")
+    return pkgname, typename.lstrip("*"), name, typename.startswith("*")
+
+
+def method_fullname(pkgname, typename, name, pointer):
+    """Return the fullname of a method, the reverse of :func:`split_method`."""
+    return "(%s.%s%s) %s" % (pkgname, "*" if pointer else "", typename, name)
+
+
+#: The inventories of the domain data.  All but "methods" are keyed by
+#: fullname, methods by package, receiver type and name.
+inventories = ("objects", "functions", "methods", "packages")
+
+#: The objtypes of inventory entries by the number stored for them.
+#: Pickled environments refer to these numbers, so only ever append.
+entry_objtypes = (
+    "function",
+    "method",
+    "type",
+    "var",
+    "const",
+    "field",
+    "interfacemethod",
+    "package",
+)
+entry_objtype_ids = dict((objtype, i) for i, objtype in enumerate(entry_objtypes))
+
+#: The objtypes of the members of types, with ``Type.Member`` fullnames.
+member_objtypes = frozenset(("field", "interfacemethod"))
+
+
+def object_entry(fullname, objtype, docname):
+    """Return the inventory of the object *fullname* of *objtype* and its
+    entry there.
+    """
+    method = split_method(fullname)
+    if method is not None:
+        # stored by receiver type, and whether it is a pointer
+        return "methods", (docname, objtype, method[3])
+    if objtype == "function":
+        return "functions", (docname, objtype)
+    return "objects", (docname, objtype)
+
+
+def encode_entry(invname, entry, docindex):
+    """Convert *entry* of the inventory *invname* to its stored form.
+
+    Docnames are replaced by their index given by the *docindex* function;
+    the index and objtype of object entries are packed into one int, along
+    with whether the receiver is a pointer for the ``(docname, objtype,
+    pointer)`` entries of methods.
+    """
+    if invname == "packages":
+        return (docindex(entry[0]),) + tuple(entry[1:])
+    if invname == "methods":
+        docname, objtype, pointer = entry
+        return docindex(docname) << 5 | pointer << 4 | entry_objtype_ids[objtype]
+    docname, objtype = entry
+    return docindex(docname) << 4 | entry_objtype_ids[objtype]
+
+
+def decode_entry(invname, value, documents):
+    """Convert the stored *value* back into an entry, see :func:`encode_entry`."""
+    if invname == "packages":
+        return (documents[value[0]],) + value[1:]
+    if invname == "methods":
+        return documents[value >> 5], entry_objtypes[value & 15], bool(value & 16)
+    return documents[value >> 4], entry_objtypes[value & 15]
+
+
+def entry_document(invname, value):
+    """Return the document index of the stored *value*."""
+    if invname == "packages":
+        return value[0]
+    return value >> 5 if invname == "methods" else value >> 4
+
+
+def encode_versioned(docindex, relative, objtype):
+    """Return the key of a versioned object described in the document of
+    index *docindex*, relative to the directory of its version or not.
+    """
+    return docindex << 5 | relative << 4 | entry_objtype_ids[objtype]
+
+
+def decode_versioned(key, version, documents):
+    """Return the ``(docname, objtype)`` of the versioned object *key* in
+    *version*, see :func:`encode_versioned`.
+    """
+    docname = documents[key >> 5]
+    if key & 16:
+        docname = "%s/%s" % (version, docname)
+    return docname, entry_objtypes[key & 15]
+
+
+def iter_versioned(data):
+    """Yield the ``(fullname, version, docname, objtype)`` of the versioned
+    objects of *data*, once per version.
+    """
+    versions = data["versions"]
+    documents = data["documents"]
+    for fullname, bitmaps in data["versioned"].items():
+        for key, bitmap in bitmaps.items():
+            for bit, version in enumerate(versions):
+                if bitmap >> bit & 1:
+                    docname, objtype = decode_versioned(key, version, documents)
+                    yield fullname, version, docname, objtype
+
+
+def iter_values(data, invname):
+    """Yield the ``(fullname, stored value)`` pairs of an inventory of *data*."""
+    if invname != "methods":
+        for item in data[invname].items():
+            yield item
+        return
+    for pkgname, types in data["methods"].items():
+        for typename, methods in types.items():
+            for name, value in methods.items():
+                pointer = bool(value & 16)
+                yield method_fullname(pkgname, typename, name, pointer), value
+
+
+def migrate_data(data):
+    """Convert domain *data* of an older version to version 8, in place.
+
+    The entries of versions 0 and 1 are tuples starting with the docname,
+    version 2 lacks the embedded fields, up to version 3 methods are kept
+    with the functions and objects, version 4 lacks the inputs of the
+    documents, version 5 the versioned objects, version 6 the conflicts,
+    and version 7 keeps the conflicts of all versions in one list.
+    """
+    version = data.get("version", 0)
+    if version < 2:
+        _migrate_entries(data)
+    data.setdefault("embedded", {})
+    if version < 4:
+        _migrate_methods(data)
+    data.setdefault("dochashes", {})
+    data.setdefault("docrefs", {})
+    data.setdefault("versions", [])
+    data.setdefault("versioned", {})
+    data.setdefault("docversions", {})
+    data.setdefault("versionentries", {})
+    if version == 7:
+        _migrate_conflicts(data)
+    data.setdefault("conflicts", {})
+    data["version"] = 8
+
+
+def _migrate_entries(data):
+    documents = []
+    docindex = {}
+
+    def index(docname):
+        if docname not in docindex:
+            docindex[docname] = len(documents)
+            documents.append(docname)
+        return docindex[docname]
+
+    docentries = {}
+    for invname in inventories:
+        inventory = data.setdefault(invname, {})
+        for fullname, entry in inventory.items():
+            value = encode_entry(invname, entry, index)
+            inventory[fullname] = value
+            docentries.setdefault(entry_document(invname, value), []).append(fullname)
+    data.pop("docnames", None)
+    data["documents"] = documents
+    data["docentries"] = docentries
+
+
+def _migrate_conflicts(data):
+    conflicts = data["conflicts"]
+    for fullname, definitions in conflicts.items():
+        versions = conflicts[fullname] = {}
+        for index, objtype, line, version in definitions:
+            versions.setdefault(version, []).append((index, objtype, line))
+
+
+def _migrate_methods(data):
+    methods = data["methods"] = {}
+    for invname in ("functions", "objects"):
+        inventory = data[invname]
+        for fullname in [name for name in inventory if split_method(name)]:
+            value = inventory.pop(fullname)
+            pkgname, typename, name, pointer = split_method(fullname)
+            value = value >> 4 << 5 | pointer << 4 | value & 15
+            methods.setdefault(pkgname, {}).setdefault(typename, {})[name] = value
+
+
+class GolangDomain(Domain):
+    """Golang language domain."""
+
+    name = "go"
+    label = "Golang"
+    object_types = {
+        "function": ObjType(_("function"), "func"),
+        "package": ObjType(_("package"), "pkg"),
+        "type": ObjType(_("function"), "type"),
+        "var": ObjType(_("variable"), "data"),
+        "const": ObjType(_("const"), "data"),
+        "method": ObjType(_("method"), "func"),
+        "field": ObjType(_("field"), "field", "data"),
+        "interfacemethod": ObjType(_("interface method"), "func"),
+    }
+
+    directives = {
+        "function": GolangObject,
+        "method": GolangObject,
+        "type": GolangObject,
+        "var": GolangObject,
+        "const": GolangObject,
+        "field": GolangMember,
+        "interfacemethod": GolangMember,
+        "package": GolangPackage,
+        "currentpackage": GolangCurrentPackage,
+        "symbols": GolangSymbols,
+        "autopackage": GolangAutoPackage,
+        "methodset": GolangMethodSet,
+    }
+
+    roles = {
+        "func": GolangXRefRole(),
+        "pkg": GolangXRefRole(),
+        "type": GolangXRefRole(),
+        "data": GolangXRefRole(),
+        "field": GolangXRefRole(),
+    }
+
+    # entries store the index of their docname in "documents" instead of
+    # the docname, and objects their objtype as a number too, which keeps
+    # the pickled environment small and quick to load; use get_entry() and
+    # iter_entries() to read them
+    initial_data = {
+        "objects": {},  # fullname -> document index << 4 | objtype number
+        "functions": {},  # fullname -> document index << 4 | objtype number
+        # pkgname -> receiver type name -> method name ->
+        #   document index << 5 | pointer receiver << 4 | objtype number
+        "methods": {},
+        "packages": {},  # pkgname -> document index, synopsis, platform, deprecated
+        "documents": [],  # document index -> docname
+        "docentries": {},  # document index -> fullnames in the inventories
+        "embedded": {},  # fullname of an embedded field -> pkgname, type or *type
+        "dochashes": {},  # document index -> hash of its inputs, see reuse
+        "docrefs": {},  # document index -> identifiers of its Go references
+        # the objects of versioned packages, see note_versioned()
+        "versions": [],  # version number -> version
+        # fullname -> document index << 5 | relative << 4 | objtype number ->
+        #   bitmap of the version numbers
+        "versioned": {},
+        "docversions": {},  # document index -> bitmap of its version numbers
+        # document index << 1 | relative -> fullnames of the versioned
+        #   objects stored with it
+        "versionentries": {},
+        # fullname -> version -> (document index, objtype, line) of all its
+        #   descriptions in the order they were read, of those described more
+        #   than once, see note_object(); those of unversioned packages end
+        #   with the synopsis, platform and deprecation
+        "conflicts": {},
+    }
+    data_version = 8
+
+    indices = [
+        GolangPackageIndex,
+        GolangSymbolIndex,
+    ]
+
+    # lookup tables derived from the inventories, see _get_lookup()
+    _lookup = None
+    # docname -> index in data["documents"], see _document_index()
+    _docindex = None
+    # (sort key, pkgname) of the packages, see get_sorted_packages()
+    _packages = None
+    # index name -> docnames -> generated content, see GolangIndex
+    _index_cache = None
+    # (intersphinx inventory, lookup table), see _get_external_names()
+    _external = None
+    # the version references are resolved in, see _get_lookup()
+    _version = None
+    # version -> lookup tables, of the versions resolved in last
+    _version_lookups = None
+    # the documents being read and their objects before, see note_reading()
+    _reading = None
+    # the identifiers of the documents' references, see note_references()
+    _refsets = None
+    # the fullnames whose descriptions conflict anew, see pop_conflicts()
+    _new_conflicts = None
+
+    def __init__(self, env):
+        data = env.domaindata.get(self.name)
+        if data is not None and data.get("version", 0) < 8:
+            migrate_data(data)
+        super(GolangDomain, self).__init__(env)
+
+    def _document_index(self, docname, add=True):
+        if self._docindex is None:
+            documents = self.data["documents"]
+            self._docindex = dict((name, i) for i, name in enumerate(documents))
+        index = self._docindex.get(docname)
+        if index is None and add:
+            index = self._docindex[docname] = len(self.data["documents"])
+            self.data["documents"].append(docname)
+        return index
+
+    def _get_value(self, invname, fullname):
+        if invname != "methods":
+            return self.data[invname].get(fullname)
+        method = split_method(fullname)
+        if method is None:
+            return None
+        pkgname, typename, name, _pointer = method
+        return self.data["methods"].get(pkgname, {}).get(typename, {}).get(name)
+
+    def _del_value(self, invname, fullname):
+        if invname != "methods":
+            del self.data[invname][fullname]
+            return
+        pkgname, typename, name, _pointer = split_method(fullname)
+        types = self.data["methods"][pkgname]
+        del types[typename][name]
+        # drop what is left empty
+        if not types[typename]:
+            del types[typename]
+            if not types:
+                del self.data["methods"][pkgname]
+
+    def get_entry(self, invname, fullname, default=None):
+        """Return the entry of *fullname* in the inventory *invname*."""
+        value = self._get_value(invname, fullname)
+        if value is None:
+            return default
+        return decode_entry(invname, value, self.data["documents"])
+
+    def iter_entries(self, invname):
+        """Yield the ``(fullname, entry)`` pairs of the inventory *invname*."""
+        documents = self.data["documents"]
+        for fullname, value in iter_values(self.data, invname):
+            yield fullname, decode_entry(invname, value, documents)
+
+    def get_methods(self, typename):
+        """Return the methods of the type *typename*, a fullname.
+
+        The result maps the method names to their ``(fullname, docname,
+        objtype, pointer)``, where *pointer* tells whether the receiver is
+        a pointer.  Promoted methods are not included, see
+        :meth:`get_members`.
+        """
+        pkgname, _dot, typename = typename.rpartition(".")
+        methods = self.data["methods"].get(pkgname, {}).get(typename, {})
+        documents = self.data["documents"]
+        result = {}
+        for name, value in methods.items():
+            docname, objtype, pointer = decode_entry("methods", value, documents)
+            fullname = method_fullname(pkgname, typename, name, pointer)
+            result[name] = (fullname, docname, objtype, pointer)
+        return result
+
+    def get_sorted_packages(self):
+        """Return the names of all packages, sorted case-insensitively."""
+        if self._packages is None:
+            packages = self.data["packages"]
+            self._packages = sorted((name.lower(), name) for name in packages)
+        return [name for _key, name in self._packages]
+
+    def _get_index_cache(self, index):
+        if self._index_cache is None:
+            self._index_cache = {}
+        return self._index_cache.setdefault(index.name, {})
+
+    def _note_package(self, pkgname, added):
+        # keep the sorted packages up to date instead of sorting again
+        if self._packages is not None:
+            item = (pkgname.lower(), pkgname)
+            if added:
+                bisect.insort(self._packages, item)
+            else:
+                del self._packages[bisect.bisect_left(self._packages, item)]
+
+    def _note_change(self, invname):
+        self._lookup = None
+        self._version_lookups = None
+        if self._index_cache:
+            for index in self.indices:
+                if invname in index.inventories:
+                    self._index_cache.pop(index.name, None)
+
+    def note_entry(self, invname, fullname, entry):
+        """Store *entry* as *fullname* in the inventory called *invname*."""
+        if invname == "packages" and fullname not in self.data["packages"]:
+            self._note_package(fullname, True)
+        value = encode_entry(invname, entry, self._document_index)
+        if invname == "methods":
+            pkgname, typename, name, _pointer = split_method(fullname)
+            types = self.data["methods"].setdefault(pkgname, {})
+            types.setdefault(typename, {})[name] = value
+        else:
+            self.data[invname][fullname] = value
+        docentries = self.data["docentries"]
+        docentries.setdefault(entry_document(invname, value), []).append(fullname)
+        self._note_change(invname)
+
+    def note_object(
+        self, fullname, objtype, docname, line=None, version=None, extra=()
+    ):
+        """Store the object *fullname* of *objtype*, described in *docname*
+        at *line*, as an object of *version* if not None.  *extra* is the
+        rest of the entry of an unversioned package, see :meth:`note_package`.
+
+        A fullname described more than once in a version, in any inventory,
+        is a conflict: all its descriptions are kept, the preferred one is
+        stored and takes over from the one stored before if need be, and
+        the next is stored when the document of the preferred one is
+        cleared.  The descriptions in the documents matching the earliest
+        of the ``golang_canonical_docnames`` patterns are preferred, then
+        those in the first document by name.
+        """
+        stored = self._find_definition(fullname, version)
+        if stored is None:
+            # the one and only description, by far the most common case
+            self._store_object(fullname, objtype, docname, version, extra)
+            return
+
+        index = self._document_index(docname)
+        versions = self.data["conflicts"].setdefault(fullname, {})
+        definitions = versions.get(version)
+        if definitions is None:
+            # conflicting only now
+            other = self._document_index(stored[0])
+            definitions = versions[version] = [(other, stored[1], None) + stored[2:]]
+            if version is not None:
+                # for clear_doc() to forget it
+                self.data["docentries"].setdefault(other, []).append(fullname)
+        definitions.append((index, objtype, line) + tuple(extra))
+        self.data["docentries"].setdefault(index, []).append(fullname)
+        if self._new_conflicts is None:
+            self._new_conflicts = set()
+        self._new_conflicts.add(fullname)
+
+        # the stored description is the preferred of those before, so one
+        # comparison will do; of the descriptions in one document, the first
+        # is preferred, the one the target of the document is for
+        patterns = self.env.config.golang_canonical_docnames
+        if definition_key(docname, patterns) < definition_key(stored[0], patterns):
+            self._unstore_object(fullname, stored, version)
+            self._store_object(fullname, objtype, docname, version, extra)
+
+    def _find_definition(self, fullname, version):
+        # the (docname, objtype) of the stored description of fullname,
+        # followed by the rest of the entry of an unversioned package
+        if version is not None:
+            return self.get_versioned_entry(version, fullname)
+        for invname in inventories:
+            value = self._get_value(invname, fullname)
+            if value is None:
+                continue
+            entry = decode_entry(invname, value, self.data["documents"])
+            if invname == "packages":
+                return (entry[0], "package") + entry[1:]
+            return entry[:2]
+        return None
+
+    def _store_object(self, fullname, objtype, docname, version, extra=()):
+        if version is not None:
+            self.note_versioned(version, fullname, docname, objtype)
+        elif objtype == "package":
+            self.note_entry("packages", fullname, (docname,) + tuple(extra))
+        else:
+            invname, entry = object_entry(fullname, objtype, docname)
+            self.note_entry(invname, fullname, entry)
+
+    def _unstore_object(self, fullname, stored, version):
+        docname, objtype = stored[:2]
+        if version is None:
+            if objtype == "package":
+                invname = "packages"
+                self._note_package(fullname, False)
+            else:
+                invname = object_entry(fullname, objtype, docname)[0]
+            self._del_value(invname, fullname)
+            self._note_change(invname)
+            return
+        bit = self.data["versions"].index(version)
+        stored, relative = self._version_document(version, docname)
+        key = encode_versioned(stored, relative, objtype)
+        bitmaps = self.data["versioned"][fullname]
+        bitmaps[key] &= ~(1 << bit)
+        if not bitmaps[key]:
+            del bitmaps[key]
+        self._note_change("versioned")
+
+    def _preferred_definition(self, definitions):
+        documents = self.data["documents"]
+        patterns = self.env.config.golang_canonical_docnames
+        return min(definitions, key=lambda d: definition_key(documents[d[0]], patterns))
+
+    def _forget_definitions(self, fullname, index):
+        # drop the descriptions of the document index of a conflicting
+        # fullname, storing the preferred of the others if need be
+        conflicts = self.data["conflicts"]
+        versions = conflicts[fullname]
+        for version, definitions in list(versions.items()):
+            definitions = [d for d in definitions if d[0] != index]
+            if definitions and self._find_definition(fullname, version) is None:
+                preferred = self._preferred_definition(definitions)
+                docname = self.data["documents"][preferred[0]]
+                self._store_object(
+                    fullname, preferred[1], docname, version, preferred[3:]
+                )
+            # only keep what still conflicts
+            if len(definitions) > 1:
+                versions[version] = definitions
+            else:
+                del versions[version]
+        if not versions:
+            del conflicts[fullname]
+
+    def get_conflicts(self, fullnames=None):
+        """Return the conflicting descriptions, of *fullnames* if given.
+
+        The result is a sorted list of ``(fullname, version, definitions,
+        preferred)``, where *definitions* are the sorted ``(docname, line,
+        objtype)`` of the descriptions of *fullname* in *version*, with
+        *line* None if unknown, and *preferred* is the one stored.
+        """
+        documents = self.data["documents"]
+        conflicts = self.data["conflicts"]
+        if fullnames is None:
+            fullnames = conflicts
+        result = []
+        for fullname in fullnames:
+            for version, definitions in conflicts.get(fullname, {}).items():
+                if len(definitions) < 2:
+                    continue
+                preferred = self._preferred_definition(definitions)
+                # lines are unknown for some descriptions in a document
+                described = sorted(
+                    ((documents[d[0]], d[2], d[1]) for d in definitions),
+                    key=lambda d: (d[0], d[1] or 0),
+                )
+                preferred = (documents[preferred[0]], preferred[2], preferred[1])
+                result.append((fullname, version, described, preferred))
+        result.sort(key=lambda item: (item[0], item[1] or ""))
+        return result
+
+    def pop_conflicts(self):
+        """Return the fullnames that conflict anew since last asked."""
+        fullnames, self._new_conflicts = self._new_conflicts or set(), None
+        return fullnames
+
+    def note_package(self, pkgname, entry, version=None, line=None):
+        """Store the package *pkgname* of *version*, if any, see
+        :meth:`note_versioned`, described at *line* of its document.
+        *entry* is its ``(docname, synopsis, platform, deprecated)``;
+        versioned packages only keep the docname.  Packages described more
+        than once are conflicts like other objects, see :meth:`note_object`.
+        """
+        extra = entry[1:] if version is None else ()
+        self.note_object(pkgname, "package", entry[0], line, version, extra)
+
+    def note_versioned(self, version, fullname, docname, objtype):
+        """Store *fullname*, described in *docname*, as an object of *version*.
+
+        The versions describing an object in the same document, or in the
+        same document relative to their directory named after the version,
+        like ``v1.2/api/io`` and ``v1.3/api/io``, share its entry, with a
+        bitmap of these versions.  References only resolve to objects of
+        their own version and unversioned ones.
+        """
+        versions = self.data["versions"]
+        if version not in versions:
+            versions.append(version)
+        bit = 1 << versions.index(version)
+        index = self._document_index(docname)
+        docversions = self.data["docversions"]
+        docversions[index] = docversions.get(index, 0) | bit
+        stored, relative = self._version_document(version, docname)
+        key = encode_versioned(stored, relative, objtype)
+        bitmaps = self.data["versioned"].setdefault(fullname, {})
+        if key not in bitmaps:
+            # the first version describing it there
+            entries = self.data["versionentries"].setdefault(key >> 4, [])
+            entries.append(fullname)
+        bitmaps[key] = bitmaps.get(key, 0) | bit
+        self._note_change("versioned")
+
+    def _version_document(self, version, docname):
+        # the index of the document versioned objects of docname are stored
+        # with, and whether it is relative to the directory of the version
+        prefix = version + "/"
+        relative = docname.startswith(prefix)
+        if relative:
+            docname = docname[len(prefix) :]
+        return self._document_index(docname), relative
+
+    def _version_place(self, version, docname):
+        # the key of the versionentries of docname
+        stored, relative = self._version_document(version, docname)
+        return stored << 1 | relative
+
+    def _iter_document_versions(self, index):
+        # the (bit, version) of the versions described in a document
+        bits = self.data["docversions"].get(index, 0)
+        for bit, version in enumerate(self.data["versions"]):
+            if bits >> bit & 1:
+                yield bit, version
+
+    def get_versioned_entry(self, version, fullname):
+        """Return the ``(docname, objtype)`` of *fullname* in *version*."""
+        versions = self.data["versions"]
+        if version not in versions:
+            return None
+        bit = versions.index(version)
+        for key, bitmap in self.data["versioned"].get(fullname, {}).items():
+            if bitmap >> bit & 1:
+                return decode_versioned(key, version, self.data["documents"])
+        return None
+
+    def note_embedded(self, fullname, pkgname, typ, version=None):
+        """Note that the field *fullname* embeds *typ*, as written in *pkgname*,
+        starting with ``*`` for a pointer.
+        """
+        key = fullname if version is None else (fullname, version)
+        self.data["embedded"][key] = (pkgname, typ)
+        self._note_change("embedded")
+
+    def _get_embedded(self, fullname):
+        embedded = self.data["embedded"]
+        if self._version is not None and (fullname, self._version) in embedded:
+            return embedded[fullname, self._version]
+        return embedded.get(fullname)
+
+    def uses_domain(self, docname):
+        """Tell whether *docname* describes or refers to Go objects."""
+        index = self._document_index(docname, add=False)
+        return (
+            index in self.data["docentries"]
+            or index in self.data["docrefs"]
+            or index in self.data["docversions"]
+        )
+
+    def note_references(self, docname, keys):
+        """Note that *docname* refers to Go objects with the identifiers *keys*."""
+        index = self._document_index(docname)
+        refs = self.data["docrefs"]
+        keys = refs.get(index, frozenset()).union(keys)
+        # the pages of versions refer to the same identifiers, keep them once
+        if self._refsets is None:
+            self._refsets = {}
+        refs[index] = self._refsets.setdefault(keys, keys)
+
+    def note_inputs(self, docname, digest):
+        """Note the hash of the inputs of *docname*."""
+        self.data["dochashes"][self._document_index(docname)] = digest
+
+    def get_inputs(self, docname):
+        """Return the hash of the inputs *docname* was last read from."""
+        return self.data["dochashes"].get(self._document_index(docname, add=False))
+
+    def iter_reference_keys(self):
+        """Yield the ``(docname, identifiers)`` of the documents' Go references."""
+        documents = self.data["documents"]
+        for index, keys in self.data["docrefs"].items():
+            yield documents[index], keys
+
+    def _document_objects(self, docnames):
+        # (invname, fullname) -> what references to it depend on
+        objects = {}
+        for docname in docnames:
+            index = self._document_index(docname, add=False)
+            for fullname in self.data["docentries"].get(index, ()):
+                for invname in inventories:
+                    entry = self.get_entry(invname, fullname)
+                    if entry is None or entry[0] != docname:
+                        continue
+                    objtype = "package" if invname == "packages" else entry[1]
+                    embedded = self.data["embedded"].get(fullname)
+                    objects[invname, fullname] = (docname, objtype, embedded)
+            for _bit, version in self._iter_document_versions(index):
+                place = self._version_place(version, docname)
+                for fullname in self.data["versionentries"].get(place, ()):
+                    entry = self.get_versioned_entry(version, fullname)
+                    if entry is None or entry[0] != docname:
+                        continue
+                    embedded = self.data["embedded"].get((fullname, version))
+                    objects[version, fullname] = entry + (embedded,)
+        return objects
+
+    def note_reading(self, docnames):
+        """Note that *docnames* are about to be read or removed."""
+        self._reading = (set(docnames), self._document_objects(docnames))
+
+    def get_moved_keys(self):
+        """Return the identifiers of the objects that were added, removed or
+        moved to another document since :meth:`note_reading`.
+        """
+        if self._reading is None:
+            return set()
+        docnames, before = self._reading
+        self._reading = None
+        after = self._document_objects(docnames)
+        keys = set()
+        for objects, other in ((before, after), (after, before)):
+            for key, value in objects.items():
+                if other.get(key) != value:
+                    keys.update(self._object_keys(key[1], value[1]))
+        return keys
+
+    def _object_keys(self, fullname, objtype):
+        # the identifiers a reference to the object is made of
+        if objtype == "package":
+            return (fullname.rpartition("/")[2],)
+        method = split_method(fullname)
+        if method is not None:
+            return method[1:3]
+        if objtype in member_objtypes:
+            typename, _dot, name = fullname.rpartition(".")
+            return (typename.rpartition(".")[2], name)
+        return (fullname.rpartition(".")[2],)
+
+    @profiled("clear_doc")
+    def clear_doc(self, docname):
+        # only visit the entries the document registered, not every entry
+        index = self._document_index(docname, add=False)
+        self.data["dochashes"].pop(index, None)
+        self.data["docrefs"].pop(index, None)
+        if index in self.data["docversions"]:
+            self._clear_versioned(index, docname)
+        fullnames = self.data["docentries"].pop(index, ())
+        for fullname in fullnames:
+            for invname in inventories:
+                value = self._get_value(invname, fullname)
+                if value is not None and entry_document(invname, value) == index:
+                    self._del_value(invname, fullname)
+                    if invname == "packages":
+                        self._note_package(fullname, False)
+                    elif invname == "objects":
+                        self.data["embedded"].pop(fullname, None)
+                    self._note_change(invname)
+        conflicts = self.data["conflicts"]
+        for fullname in fullnames:
+            if fullname in conflicts:
+                self._forget_definitions(fullname, index)
+
+    def _clear_versioned(self, index, docname):
+        # drop the versions of docname from the entries stored with it
+        versioned = self.data["versioned"]
+        versionentries = self.data["versionentries"]
+        for bit, version in list(self._iter_document_versions(index)):
+            place = self._version_place(version, docname)
+            remaining = []
+            for fullname in versionentries.pop(place, ()):
+                bitmaps = versioned.get(fullname, {})
+                for key, bitmap in list(bitmaps.items()):
+                    if key >> 4 != place or not bitmap >> bit & 1:
+                        continue
+                    bitmap &= ~(1 << bit)
+                    if bitmap:
+                        bitmaps[key] = bitmap
+                    else:
+                        del bitmaps[key]
+                    self.data["embedded"].pop((fullname, version), None)
+                if any(key >> 4 == place for key in bitmaps):
+                    # described by other versions still
+                    remaining.append(fullname)
+                if not bitmaps:
+                    versioned.pop(fullname, None)
+            if remaining:
+                versionentries[place] = remaining
+        del self.data["docversions"][index]
+        self._note_change("versioned")
+
+    def merge_domaindata(self, docnames, otherdata):
+        # the document indices of the other data are its own
+        documents = otherdata["documents"]
+        # (fullname, docname, version, objtype, line, extra) of the
+        # descriptions of the other process, those it did not store
+        # included; the conflicts of a fullname in a version list all its
+        # descriptions, in the order they were read
+        definitions = []
+        conflicting = set()
+        for fullname, versions in otherdata["conflicts"].items():
+            for version, others in versions.items():
+                conflicting.add((fullname, version))
+                for other in others:
+                    index, objtype, line = other[:3]
+                    definitions.append(
+                        (fullname, documents[index], version, objtype, line, other[3:])
+                    )
+        for invname in inventories:
+            for fullname, value in iter_values(otherdata, invname):
+                if (fullname, None) in conflicting:
+                    continue
+                entry = decode_entry(invname, value, documents)
+                if invname == "packages":
+                    objtype, extra = "package", entry[1:]
+                else:
+                    objtype, extra = entry[1], ()
+                definitions.append((fullname, entry[0], None, objtype, None, extra))
+        for fullname, version, docname, objtype in iter_versioned(otherdata):
+            if (fullname, version) not in conflicting:
+                definitions.append((fullname, docname, version, objtype, None, ()))
+        # sorted stably, the first description in a document stays first
+        definitions.sort(key=lambda d: d[:2])
+        for fullname, docname, version, objtype, line, extra in definitions:
+            if docname not in docnames:
+                continue
+            self.note_object(fullname, objtype, docname, line, version, extra)
+            key = fullname if version is None else (fullname, version)
+            if key in otherdata["embedded"]:
+                self.data["embedded"][key] = otherdata["embedded"][key]
+        for index, digest in otherdata["dochashes"].items():
+            if documents[index] in docnames:
+                self.note_inputs(documents[index], digest)
+        for index, keys in otherdata["docrefs"].items():
+            if documents[index] in docnames:
+                self.note_references(documents[index], keys)
+        self._note_change("embedded")
+
+    def _get_lookup(self):
+        """Return the lookup tables, building them if the data changed.
+
+        ``names`` maps every unqualified or partially qualified spelling of
+        a name (``Reader``, ``io.Reader``, ``acme/io.Reader``) to the
+        sorted fullnames it may refer to, ``entries`` and ``roles`` map
+        fullnames to their entry, for all of them and per role,
+        ``methods`` and ``members`` map a type's fullname to the fullnames
+        of its methods, and of its fields and interface methods, by name,
+        and ``packages`` maps package names to their docname.
+
+        The tables of a version, the one references are resolved in, also
+        include the objects of that version.  Those of the last
+        ``VERSION_LOOKUPS`` versions are kept, as documents are mostly
+        resolved one version after the other.
+        """
+        version = self._version
+        if version is None:
+            if self._lookup is None:
+                self._lookup = self._build_lookup(self._iter_objects())
+            return self._lookup
+
+        if self._version_lookups is None:
+            self._version_lookups = collections.OrderedDict()
+        lookup = self._version_lookups.get(version)
+        if lookup is None:
+            objects = itertools.chain(
+                self._iter_objects(), self._iter_version_objects(version)
+            )
+            lookup = self._version_lookups[version] = self._build_lookup(objects)
+            while len(self._version_lookups) > VERSION_LOOKUPS:
+                self._version_lookups.popitem(last=False)
+        return lookup
+
+    def _iter_objects(self):
+        # (fullname, docname, objtype) of the unversioned objects
+        for pkgname, entry in self.iter_entries("packages"):
+            yield pkgname, entry[0], "package"
+        for invname in ("functions", "objects", "methods"):
+            for fullname, entry in self.iter_entries(invname):
+                yield fullname, entry[0], entry[1]
+
+    def _iter_version_objects(self, version):
+        # (fullname, docname, objtype) of the objects of version
+        versions = self.data["versions"]
+        if version not in versions:
+            return
+        bit = versions.index(version)
+        documents = self.data["documents"]
+        for fullname, bitmaps in self.data["versioned"].items():
+            for key, bitmap in bitmaps.items():
+                if bitmap >> bit & 1:
+                    yield (fullname,) + decode_versioned(key, version, documents)
+
+    def _build_lookup(self, objects):
+        names = {}
+        entries = {}
+        roles = {}
+        methods = {}
+        members = {}
+        packages = {}
+        for fullname, docname, objtype in objects:
+            if objtype == "package":
+                # the documents of a version may all declare its package
+                packages[fullname] = min(docname, packages.get(fullname, docname))
+                continue
+            entries[fullname] = (docname, objtype)
+            obj_type = self.object_types.get(objtype)
+            for role in obj_type.roles if obj_type else ():
+                roles.setdefault(role, {})[fullname] = docname
+
+            if objtype in member_objtypes:
+                typ, _dot, member = fullname.rpartition(".")
+                members.setdefault(typ, {})[member] = fullname
+                for key in member_keys(fullname):
+                    names.setdefault(key, set()).add(fullname)
+                continue
+
+            method = split_method(fullname)
+            if method is not None:
+                # "(pkg.*T) Name" belongs to the type "pkg.T"
+                pkgname, typename, funcname, _pointer = method
+                typ = "%s.%s" % (pkgname, typename)
+                methods.setdefault(typ, {})[funcname] = fullname
+                fullname = typ
+
+            for key in name_keys(fullname):
+                names.setdefault(key, set()).add(fullname)
+
+        names = dict((key, sorted(value)) for key, value in names.items())
+        return {
+            "names": names,
+            "entries": entries,
+            "roles": roles,
+            "methods": methods,
+            "members": members,
+            "packages": packages,
+            # type fullname -> members, see get_members()
+            "promoted": {},
+        }
+
+    def get_members(self, typename):
+        """Return the members of the type *typename*, by name.
+
+        Fields, interface methods and methods are mapped to their fullname,
+        including those promoted from embedded fields, however deeply
+        nested.  As in Go, the least deeply embedded member of a name wins
+        and names embedded as deeply more than once are left out.  The
+        members of a type are only computed when first asked for, along
+        with those of the types it embeds, and kept with the lookup tables.
+        """
+        members = self._get_lookup()["promoted"].get(typename)
+        if members is None:
+            members = self._promote(typename, set())
+        return dict(
+            (name, fullname)
+            for name, (_depth, fullname, _pointer) in members.items()
+            if fullname is not None
+        )
+
+    def get_method_set(self, typename, pointer=False):
+        """Return the methods in the method set of the type *typename*, or
+        of its pointer type if *pointer*, by name.
+
+        As in Go, methods with a pointer receiver are only in the method
+        set of a type if promoted through an embedded pointer.
+        """
+        lookup = self._get_lookup()
+        members = lookup["promoted"].get(typename)
+        if members is None:
+            members = self._promote(typename, set())
+        entries = lookup["entries"]
+        methods = {}
+        for name, (_depth, fullname, via_pointer) in members.items():
+            if fullname is None:
+                continue
+            objtype = entries[fullname][1]
+            if objtype not in ("function", "method", "interfacemethod"):
+                continue
+            method = split_method(fullname)
+            if pointer or via_pointer or method is None or not method[3]:
+                methods[name] = fullname
+        return methods
+
+    def _promote(self, typename, visiting):
+        # name -> (depth, fullname or None if ambiguous, whether promoted
+        # through an embedded pointer) of typename
+        lookup = self._get_lookup()
+        members = dict(
+            (name, (0, fullname, False))
+            for table in ("methods", "members")
+            for name, fullname in lookup[table].get(typename, {}).items()
+        )
+        promoted = {}
+        visiting.add(typename)
+        known = lookup["roles"].get("type", {})
+        for fullname in lookup["members"].get(typename, {}).values():
+            field = self._get_embedded(fullname)
+            if field is None:
+                continue
+            pkgname, typ = field
+            pointer = typ.startswith("*")
+            embedded = self._lookup_name(pkgname, typ.lstrip("*"), known)
+            if embedded is None or embedded in visiting:
+                continue
+            inner = lookup["promoted"].get(embedded)
+            if inner is None:
+                inner = self._promote(embedded, visiting)
+            for name, (depth, member, via_pointer) in inner.items():
+                via_pointer = via_pointer or pointer
+                other = promoted.get(name)
+                if other is None or depth + 1 < other[0]:
+                    promoted[name] = (depth + 1, member, via_pointer)
+                elif depth + 1 == other[0] and member != other[1]:
+                    promoted[name] = (depth + 1, None, False)
+                elif depth + 1 == other[0] and via_pointer:
+                    promoted[name] = (depth + 1, member, True)
+        visiting.discard(typename)
+        for name, value in promoted.items():
+            members.setdefault(name, value)
+        lookup["promoted"][typename] = members
+        return members
+
+    def _find_member(self, pkgname, name, location=None):
+        # "T.Name" for a member promoted from a field embedded in T
+        typ, _dot, member = strip_type_args(name).rpartition(".")
+        if not typ:
+            return None
+        known = self._get_lookup()["roles"].get("type", {})
+        typ = self._lookup_name(pkgname, typ, known, location)
+        if typ is None:
+            return None
+        return self.get_members(typ).get(member)
+
+    def _lookup_names(self, pkgname, name, known):
+        """Find the fullnames in *known* that *name* refers to from *pkgname*.
+
+        Exact and package-relative names win over import path suffixes and
+        bare names, which are looked up in the precomputed name table, and
+        of these the ones in *pkgname* win over those of other packages.
+        Instantiated generic types like ``List[int]`` refer to ``List``.
+        """
+        name = strip_type_args(name)
+        for fullname in (name, "%s.%s" % (pkgname, name)):
+            if fullname in known:
+                return [fullname]
+        candidates = self._get_lookup()["names"].get(name, ())
+        matches = [fullname for fullname in candidates if fullname in known]
+        if len(matches) > 1 and pkgname:
+            prefix = pkgname + "."
+            local = [
+                fullname
+                for fullname in matches
+                if fullname.startswith(prefix) and "/" not in fullname[len(prefix) :]
+            ]
+            if local:
+                return local
+        return matches
+
+    def _lookup_name(self, pkgname, name, known, location=None):
+        """Return the first fullname in *known* that *name* refers to from
+        *pkgname*, or None, warning at *location*, if given, when there are
+        several.
+        """
+        matches = self._lookup_names(pkgname, name, known)
+        if len(matches) > 1 and location is not None:
+            logger.warning(
+                _("more than one target found for cross-reference %r: %s"),
+                name,
+                ", ".join(matches),
+                type="ref",
+                subtype="go",
+                location=location,
+            )
+        return matches[0] if matches else None
+
+    def _find_method(self, pkgname, name, location=None):
+        name = strip_type_args(name)
+        m = go_func_split_re.match(name)
+        if m is not None:
+            # "(t *T) Name", "(*T) Name" or "(T) Name"
+            typ, funcname = m.groups()
+            typ = typ.split()[-1].replace("*", "")
+        elif "." in name:
+            # "T.Name"
+            typ, _dot, funcname = name.rpartition(".")
+        else:
+            return None
+
+        methods = self._get_lookup()["methods"]
+        typ = self._lookup_name(pkgname, typ, methods, location)
+        if typ is None:
+            return None
+        return methods[typ].get(funcname)
+
+    def _find_obj(self, env, pkgname, name, typ, location=None):
+        """Find a Go object for "name", perhaps using the given package.
+
+        Returns a (fullname, docname) tuple, or (None, None).  Ambiguous
+        names are warned about at *location*, if given.
+        """
+        if not name:
+            return None, None
+
+        known = self._get_lookup()["roles"].get(typ, {})
+        fullname = self._lookup_name(pkgname, name, known, location)
+        if fullname is None and typ == "func":
+            fullname = self._find_method(pkgname, name, location)
+        if fullname is None:
+            fullname = self._find_member(pkgname, name, location)
+        if fullname is None or fullname not in known:
+            return None, None
+        return fullname, known[fullname]
+
+    def _make_package_refnode(self, builder, fromdocname, pkgname, contnode):
+        docname = self._get_lookup()["packages"][pkgname]
+        title = ""
+        entry = self.get_entry("packages", pkgname)
+        if entry is not None and entry[0] == docname:
+            _docname, synopsis, platform, deprecated = entry
+            title = "%s%s%s" % (
+                (platform and "(%s) " % platform),
+                synopsis,
+                (deprecated and " (deprecated)" or ""),
+            )
+        return make_refnode(
+            builder, fromdocname, docname, "package-" + pkgname, contnode, title
+        )
+
+    @profiled("resolve_xref")
+    def resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        refnode = self._resolve_xref(
+            env, fromdocname, builder, typ, target, node, contnode
+        )
+        profile = get_profile(env)
+        if profile is not None:
+            profile.note_xref(target, refnode is not None)
+        return refnode
+
+    def _resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        found = self.find_xref_target(typ, target, node, warn=True)
+        if found is None:
+            # intersphinx only knows exact names, so hand it the fullname a
+            # short name like "Reader" refers to
+            fullname = self._find_external(node.get("go:package"), target, typ)
+            if fullname is not None:
+                node["reftarget"] = fullname
+            return None
+        fullname, docname, objtype = found
+        if objtype == "package":
+            return self._make_package_refnode(builder, fromdocname, fullname, contnode)
+        return make_refnode(builder, fromdocname, docname, fullname, contnode, fullname)
+
+    def find_xref_target(self, typ, target, node, warn=False):
+        """Return the ``(fullname, docname, objtype)`` of the object the
+        reference *node* of the role *typ*, or ``any``, to *target* resolves
+        to in this project, or None.  With *warn*, a *target* that more
+        than one object of the role may be is warned about.
+        """
+        self.use_version(node.get("go:version"))
+        lookup = self._get_lookup()
+        if typ in ("pkg", "any") and target in lookup["packages"]:
+            return target, lookup["packages"][target], "package"
+        pkgname = node.get("go:package")
+        if typ == "any":
+            fullnames = self._find_any(pkgname, target)
+            fullname = fullnames[0] if fullnames else None
+        else:
+            location = node if warn else None
+            fullname, _docname = self._find_obj(
+                self.env, pkgname, target, typ, location
+            )
+        if fullname is None:
+            return None
+        return (fullname,) + lookup["entries"][fullname]
+
+    def _find_any(self, pkgname, target):
+        # a single pass over the shared tables instead of one per role
+        entries = self._get_lookup()["entries"]
+        fullnames = self._lookup_names(pkgname, target, entries)
+        if not fullnames:
+            method = self._find_method(pkgname, target)
+            method = method or self._find_member(pkgname, target)
+            fullnames = [method] if method else []
+        return fullnames
+
+    def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
+        self.use_version(node.get("go:version"))
+        results = []
+        if target in self._get_lookup()["packages"]:
+            refnode = self._make_package_refnode(builder, fromdocname, target, contnode)
+            results.append(("go:pkg", refnode))
+
+        entries = self._get_lookup()["entries"]
+        for fullname in self._find_any(node.get("go:package"), target):
+            docname, objtype = entries[fullname]
+            role = self.role_for_objtype(objtype)
+            if role is None:
+                continue
+            refnode = make_refnode(
+                builder, fromdocname, docname, fullname, contnode, fullname
+            )
+            results.append(("go:" + role, refnode))
+        return results
+
+    def use_version(self, version):
+        """Resolve references in *version*, or ``golang_default_version`` if
+        None, from now on.
+        """
+        self._version = version or self.env.config.golang_default_version
+
+    def _get_external_names(self):
+        """Return the Go names in the intersphinx inventories.
+
+        The result maps roles to the spellings of names, as in the
+        ``names`` table of :meth:`_get_lookup`, to the sorted fullnames
+        they may refer to.  Methods ``(acme/io.*File) Read`` are known as
+        ``File.Read`` and so on, packages ``acme/io`` as ``io`` too.
+        """
+        # loaded once, before anything is resolved
+        inventory = getattr(self.env, "intersphinx_inventory", None) or {}
+        if self._external is not None and self._external[0] is inventory:
+            return self._external[1]
+
+        table = {}
+        for key, items in inventory.items():
+            domain, _colon, objtype = key.partition(":")
+            if domain != self.name or objtype not in self.object_types:
+                continue
+            for role in self.object_types[objtype].roles:
+                names = table.setdefault(role, {})
+                for fullname in items:
+                    m = go_func_split_re.match(fullname)
+                    if objtype == "package":
+                        path = fullname.split("/")
+                        keys = ["/".join(path[i:]) for i in range(len(path))]
+                    elif objtype in member_objtypes:
+                        keys = member_keys(fullname)
+                    elif m is None:
+                        keys = name_keys(fullname)
+                    else:
+                        typ, funcname = m.groups()
+                        keys = name_keys(typ.replace("*", ""))
+                        keys = ["%s.%s" % (key, funcname) for key in keys]
+                    for key in keys:
+                        names.setdefault(key, set()).add(fullname)
+
+        for names in table.values():
+            for key, fullnames in names.items():
+                names[key] = sorted(fullnames)
+        self._external = (inventory, table)
+        return table
+
+    def _find_external(self, pkgname, name, typ):
+        names = self._get_external_names().get(typ)
+        if not names:
+            return None
+        name = strip_type_args(name)
+        for key in ("%s.%s" % (pkgname, name), name):
+            if key in names:
+                return names[key][0]
+        return None
+
+    def iter_objects(self):
+        """Yield the ``(fullname, objtype, docname, version)`` of all objects,
+        packages included, those of versioned packages once per version and
+        the others with the version None.
+        """
+        for fullname, docname, objtype in self._iter_objects():
+            yield fullname, objtype, docname, None
+        for fullname, version, docname, objtype in iter_versioned(self.data):
+            yield fullname, objtype, docname, version
+
+    def get_objects(self):
+        for fullname, objtype, docname, _version in self.iter_objects():
+            if objtype == "package":
+                yield (fullname, fullname, objtype, docname, "package-" + fullname, 0)
+            else:
+                yield (fullname, fullname, objtype, docname, fullname, 1)
+
+
+def _method_title(fullname):
+    # the fullname without its package: "(*T) Name" or "T.Name"
+    method = split_method(fullname)
+    if method is not None:
+        _pkgname, typename, name, pointer = method
+        return "(%s%s) %s" % ("*" if pointer else "", typename, name)
+    typename, _dot, name = fullname.rpartition(".")
+    return "%s.%s" % (typename.rpartition(".")[2], name)
+
+
+def process_methodsets(app, doctree, fromdocname):
+    domain = app.env.get_domain("go")
+    # Node.findall() is new in docutils 0.18
+    findall = getattr(doctree, "findall", None) or doctree.traverse
+    for node in list(findall(methodset)):
+        domain.use_version(node.get("go:version"))
+        pkgname = node["go:package"]
+        target = strip_type_args(node["reftarget"])
+        pointer = target.startswith("*")
+        target = target.lstrip("*")
+        known = domain._get_lookup()["roles"].get("type", {})
+        typename = domain._lookup_name(pkgname, target, known, node)
+        if typename is None:
+            logger.warning(
+                _("unknown Golang type for its method set: %s"),
+                node["reftarget"],
+                location=node,
+            )
+            node.replace_self([])
+            continue
+
+        entries = domain._get_lookup()["entries"]
+        methods = [
+            (name, fullname, entries[fullname][0])
+            for name, fullname in domain.get_method_set(typename, pointer).items()
+        ]
+        result = nodes.bullet_list()
+        for _name, fullname, docname in sorted(methods):
+            title = _method_title(fullname)
+            para = nodes.paragraph()
+            para += make_refnode(
+                app.builder,
+                fromdocname,
+                docname,
+                fullname,
+                nodes.literal(title, title),
+                fullname,
+            )
+            result += nodes.list_item("", para)
+        node.replace_self([result] if methods else [])
+
+
+def report_signature_cache(app, exception):
+    if exception is None and app.config.golang_signature_cache_stats:
+        info = parse_signature.cache_info()
+        logger.info(
+            _("Golang signature cache: %d hits, %d misses, %d of %d entries used"),
+            info.hits,
+            info.misses,
+            info.currsize,
+            info.maxsize,
+        )
+
+
+def setup(app):
+    app.add_domain(GolangDomain)
+    app.add_node(methodset)
+    app.add_config_value("golang_signature_cache_stats", False, "")
+    app.add_config_value("golang_source_workers", 1, "")
+    app.add_config_value("golang_profile", False, "")
+    app.add_config_value("golang_nitpick_aggregate", True, "")
+    app.add_config_value("golang_nitpick_ignore", [], "")
+    app.add_config_value("golang_search_index", False, "html")
+    app.add_config_value("golang_reuse_unchanged", True, "env")
+    app.add_config_value("golang_default_version", None, "env")
+    app.add_config_value("golang_export", [], "")
+    app.add_config_value("golang_canonical_docnames", [], "env")
+    app.connect("builder-inited", init_profile)
+    app.connect("builder-inited", init_missing)
+    app.connect("builder-inited", init_search_index)
+    app.connect("env-merge-info", merge_profile)
+    app.connect("env-get-outdated", skip_unchanged)
+    app.connect("doctree-read", note_document)
+    app.connect("env-get-updated", find_moved_references)
+    app.connect("env-check-consistency", report_conflicts)
+    app.connect("warn-missing-reference", note_missing_reference)
+    app.connect("doctree-resolved", process_methodsets)
+    app.connect("build-finished", report_signature_cache)
+    app.connect("build-finished", write_profile)
+    app.connect("build-finished", report_missing)
+    app.connect("build-finished", write_search_index)
+    app.connect("build-finished", write_export)
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
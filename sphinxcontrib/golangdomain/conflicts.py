@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.conflicts
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    One report of the Go objects described more than once.
+
+    The domain keeps every description of a fullname described more than
+    once, in whichever document, parallel reader or inventory, see
+    ``GolangDomain.note_object()``.  Once all documents are read, the
+    conflicts involving the documents read are reported together, sorted
+    by fullname, each with the locations of its descriptions and the one
+    references resolve to.  That is the one in the documents matching the
+    earliest of the glob patterns of ``golang_canonical_docnames``, then
+    the one in the first document by name.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import fnmatch
+
+from sphinx import addnodes
+from sphinx.locale import _
+from sphinx.util import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def definition_key(docname, patterns):
+    """Return the sort key of a description in *docname*, the preferred
+    ones first, given the glob *patterns* of canonical docnames.
+    """
+    for rank, pattern in enumerate(patterns):
+        if fnmatch.fnmatchcase(docname, pattern):
+            return rank, docname
+    return len(patterns), docname
+
+
+class Locations(object):
+    """
+    The source locations of descriptions, looked up in the doctrees for
+    those whose line is not known.
+    """
+
+    def __init__(self, env):
+        self.env = env
+        # docname -> fullname -> line
+        self.lines = {}
+
+    def _document_lines(self, docname):
+        lines = {}
+        try:
+            doctree = self.env.get_doctree(docname)
+        except (IOError, OSError):
+            return lines
+        findall = getattr(doctree, "findall", None) or doctree.traverse
+        for node in findall(addnodes.desc_signature):
+            for fullname in node["ids"]:
+                lines.setdefault(fullname, node.line)
+        # packages by their index entries, as their targets may have been
+        # moved to the section they start, see GolangPackage
+        for node in findall(addnodes.index):
+            if node.line is None:
+                continue
+            for entry in node["entries"]:
+                if entry[2].startswith("package-"):
+                    lines.setdefault(entry[2][len("package-") :], node.line)
+        return lines
+
+    def get(self, docname, fullname, line):
+        filename = self.env.doc2path(docname)
+        if line is None:
+            if docname not in self.lines:
+                self.lines[docname] = self._document_lines(docname)
+            line = self.lines[docname].get(fullname)
+        return filename if line is None else "%s:%s" % (filename, line)
+
+
+def format_conflict(locations, fullname, version, definitions, preferred):
+    described = ", ".join(
+        "%s (%s)" % (locations.get(docname, fullname, line), objtype)
+        for docname, line, objtype in definitions
+    )
+    name = fullname if version is None else "%s [%s]" % (fullname, version)
+    return "%s: %s; using %s" % (
+        name,
+        described,
+        locations.get(preferred[0], fullname, preferred[1]),
+    )
+
+
+def report_conflicts(app, env):
+    domain = env.get_domain("go")
+    fullnames = domain.pop_conflicts()
+    if not fullnames:
+        return
+    locations = Locations(env)
+    lines = [
+        format_conflict(locations, *conflict)
+        for conflict in domain.get_conflicts(fullnames)
+    ]
+    if lines:
+        logger.warning(
+            _("%d Golang objects described more than once:\n  %s"),
+            len(lines),
+            "\n  ".join(lines),
+            type="ref",
+            subtype="go",
+        )
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.export
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    The Go symbols and the references between them, for other tools.
+
+    ``golang_export`` lists the formats written to the output directory at
+    the end of a build:
+
+    * ``"jsonl"``: ``golang-symbols.jsonl``, a JSON object per line, with
+      its ``"kind"`` being ``"package"``, ``"symbol"`` or ``"reference"``
+      and the other keys the columns of the tables below;
+    * ``"sqlite"``: ``golang-symbols.sqlite``, a database of the tables
+      ``packages``, ``symbols`` and ``refs``, indexed for looking symbols
+      up by name, fullname, package and type, and references by source,
+      target and document.
+
+    Methods, fields and interface methods know the fullname of their
+    ``type``, and methods whether their receiver is a ``pointer``.  A
+    reference is made from a document, and from the ``source`` object it
+    is written in the description of, if any, to the ``fullname`` it
+    resolves to in ``target_docname``, which are null if it does not
+    resolve in this project, and ``version`` is the one it resolves in.
+    Every doctree is read again to find the references, in order for the
+    export of an incremental build to be complete.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import io
+import json
+import os
+import sqlite3
+
+from docutils.utils import get_source_line
+
+from sphinx import addnodes
+from sphinx.locale import _
+from sphinx.util import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+BASENAME = "golang-symbols"
+
+#: The columns of the tables, in order.
+columns = {
+    "packages": (
+        "name",
+        "version",
+        "docname",
+        "anchor",
+        "uri",
+        "synopsis",
+        "platform",
+        "deprecated",
+    ),
+    "symbols": (
+        "fullname",
+        "name",
+        "objtype",
+        "package",
+        "type",
+        "pointer",
+        "version",
+        "docname",
+        "anchor",
+        "uri",
+    ),
+    "refs": (
+        "docname",
+        "line",
+        "source",
+        "role",
+        "target",
+        "fullname",
+        "target_docname",
+        "version",
+    ),
+}
+
+#: The columns of SQLite type INTEGER, the others are TEXT.
+integer_columns = frozenset(("deprecated", "pointer", "line"))
+
+#: The "kind" of the JSON-lines records of the tables.
+kinds = {"packages": "package", "symbols": "symbol", "refs": "reference"}
+
+indexes = {
+    "packages": [("name", "version")],
+    "symbols": [
+        ("name",),
+        ("fullname", "version"),
+        ("package", "version"),
+        ("type", "version"),
+        ("docname",),
+    ],
+    "refs": [("fullname", "version"), ("source",), ("docname",)],
+}
+
+
+def symbol_parts(fullname, objtype):
+    """Return the ``(package, name, type, pointer)`` of the symbol *fullname*.
+
+    *type* is the fullname of the type of methods and members, and
+    *pointer* whether the receiver of a method is a pointer, None for the
+    other symbols.
+    """
+    if fullname.startswith("("):
+        # "(pkg.*T) Name"
+        receiver, _paren, name = fullname[1:].partition(") ")
+        pkgname, _dot, typename = receiver.rpartition(".")
+        pointer = typename.startswith("*")
+        return pkgname, name, "%s.%s" % (pkgname, typename.lstrip("*")), pointer
+    if objtype in ("field", "interfacemethod"):
+        # "pkg.T.Name"
+        typename, _dot, name = fullname.rpartition(".")
+        return typename.rpartition(".")[0], name, typename, None
+    pkgname, _dot, name = fullname.rpartition(".")
+    return pkgname, name, None, None
+
+
+def _target_uri(builder, docname, anchor):
+    try:
+        uri = builder.get_target_uri(docname)
+    except NotImplementedError:
+        # builders without pages of their own
+        return None
+    return "%s#%s" % (uri, anchor)
+
+
+def iter_packages(app, domain):
+    for fullname, objtype, docname, version in domain.iter_objects():
+        if objtype != "package":
+            continue
+        synopsis, platform, deprecated = "", "", False
+        entry = domain.get_entry("packages", fullname)
+        if entry is not None and entry[0] == docname:
+            _docname, synopsis, platform, deprecated = entry
+        anchor = "package-" + fullname
+        uri = _target_uri(app.builder, docname, anchor)
+        yield (fullname, version, docname, anchor, uri, synopsis, platform, deprecated)
+
+
+def iter_symbols(app, domain):
+    for fullname, objtype, docname, version in domain.iter_objects():
+        if objtype == "package":
+            continue
+        pkgname, name, typename, pointer = symbol_parts(fullname, objtype)
+        uri = _target_uri(app.builder, docname, fullname)
+        yield (
+            fullname,
+            name,
+            objtype,
+            pkgname,
+            typename,
+            pointer,
+            version,
+            docname,
+            fullname,
+            uri,
+        )
+
+
+def _source_object(node):
+    # the fullname of the Go object whose description contains node
+    while node is not None:
+        if isinstance(node, addnodes.desc) and node.get("domain") == "go":
+            for signode in node.children:
+                if isinstance(signode, addnodes.desc_signature) and signode["ids"]:
+                    return signode["ids"][0]
+            return None
+        node = node.parent
+    return None
+
+
+def iter_refs(app, domain):
+    env = app.env
+    default_version = app.config.golang_default_version
+    for docname in sorted(env.found_docs):
+        doctree = env.get_doctree(docname)
+        findall = getattr(doctree, "findall", None) or doctree.traverse
+        for node in findall(addnodes.pending_xref):
+            role = node.get("reftype")
+            if node.get("refdomain") != "go" and role != "any":
+                continue
+            target = node["reftarget"]
+            found = domain.find_xref_target(role, target, node)
+            if found is None and role == "any":
+                # maybe a reference to something else
+                continue
+            yield (
+                docname,
+                get_source_line(node)[1],
+                _source_object(node),
+                role,
+                target,
+                found[0] if found else None,
+                found[1] if found else None,
+                node.get("go:version") or default_version,
+            )
+
+
+def write_jsonl(filename, tables):
+    with io.open(filename, "w", encoding="utf-8") as f:
+        for table, rows in tables:
+            names = columns[table]
+            for row in rows:
+                record = dict(zip(names, row))
+                record["kind"] = kinds[table]
+                f.write(json.dumps(record, ensure_ascii=False, sort_keys=True))
+                f.write("\n")
+
+
+def write_sqlite(filename, tables):
+    if os.path.exists(filename):
+        os.remove(filename)
+    db = sqlite3.connect(filename)
+    try:
+        for table, rows in tables:
+            names = columns[table]
+            definitions = [
+                "%s %s" % (name, "INTEGER" if name in integer_columns else "TEXT")
+                for name in names
+            ]
+            db.execute("CREATE TABLE %s (%s)" % (table, ", ".join(definitions)))
+            db.executemany(
+                "INSERT INTO %s VALUES (%s)" % (table, ", ".join("?" * len(names))),
+                rows,
+            )
+            # indexing afterwards is quicker than while inserting
+            for index in indexes[table]:
+                db.execute(
+                    "CREATE INDEX %s_%s ON %s (%s)"
+                    % (table, "_".join(index), table, ", ".join(index))
+                )
+        db.commit()
+    finally:
+        db.close()
+
+
+writers = {"jsonl": write_jsonl, "sqlite": write_sqlite}
+
+
+def write_export(app, exception):
+    formats = app.config.golang_export
+    if exception is not None or not formats:
+        return
+    domain = app.env.get_domain("go")
+    tables = [
+        ("packages", list(iter_packages(app, domain))),
+        ("symbols", list(iter_symbols(app, domain))),
+        ("refs", list(iter_refs(app, domain))),
+    ]
+    for fmt in formats:
+        if fmt not in writers:
+            logger.warning(_("unknown golang_export format: %r"), fmt)
+            continue
+        filename = os.path.join(app.outdir, "%s.%s" % (BASENAME, fmt))
+        # readers never see a file being written
+        writers[fmt](filename + ".tmp", tables)
+        os.replace(filename + ".tmp", filename)
+    logger.info(
+        _("Golang export: %d packages, %d symbols, %d references"),
+        *[len(rows) for _table, rows in tables]
+    )
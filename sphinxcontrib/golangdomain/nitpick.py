@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.nitpick
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    One report of the unresolved Go references of a nitpicky build.
+
+    Instead of a warning per reference, the missing targets are collected
+    and reported once at the end of the build, each with the number of
+    references to it and where the first of them are.  Targets matching a
+    glob pattern of ``golang_nitpick_ignore``, alone or qualified with the
+    package they are referenced from, are left out.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import fnmatch
+import re
+
+from docutils.utils import get_source_line
+
+from sphinx.locale import _
+from sphinx.util import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+#: How many locations are reported per missing target.
+LOCATIONS = 3
+
+
+class MissingReferences(object):
+    """
+    The unresolved references of a build, by role and target.
+    """
+
+    def __init__(self, ignore=()):
+        patterns = "|".join(fnmatch.translate(pattern) for pattern in ignore)
+        self.ignore_re = re.compile(patterns) if patterns else None
+        # (role, target) -> [count, locations], or None if ignored
+        self.targets = {}
+
+    def is_ignored(self, target, pkgname):
+        if self.ignore_re is None:
+            return False
+        if self.ignore_re.match(target):
+            return True
+        return bool(pkgname) and self.ignore_re.match("%s.%s" % (pkgname, target))
+
+    def add(self, role, target, pkgname, location):
+        key = (role, target)
+        if key not in self.targets:
+            ignored = self.is_ignored(target, pkgname)
+            self.targets[key] = None if ignored else [0, []]
+        entry = self.targets[key]
+        if entry is not None:
+            entry[0] += 1
+            if len(entry[1]) < LOCATIONS:
+                entry[1].append(location)
+
+    def report(self):
+        """Return the lines of the report, most often missed targets first."""
+        entries = sorted(
+            (-entry[0], role, target, entry[1])
+            for (role, target), entry in self.targets.items()
+            if entry is not None
+        )
+        lines = []
+        for count, role, target, locations in entries:
+            lines.append(
+                "go:%s:%s (%d): %s" % (role, target, -count, ", ".join(locations))
+            )
+        return lines
+
+
+def init_missing(app):
+    # the references missed by a build, kept off the environment to never
+    # be pickled with it
+    app.golang_missing = None
+    if app.config.nitpicky and app.config.golang_nitpick_aggregate:
+        app.golang_missing = MissingReferences(app.config.golang_nitpick_ignore)
+
+
+def note_missing_reference(app, domain, node):
+    missing = getattr(app, "golang_missing", None)
+    if missing is None or domain is None or domain.name != "go":
+        return None
+    source, line = get_source_line(node)
+    if source is None:
+        source = app.env.doc2path(node["refdoc"])
+    location = source if line is None else "%s:%s" % (source, line)
+    missing.add(node["reftype"], node["reftarget"], node.get("go:package"), location)
+    # the reference is reported with the others at the end
+    return True
+
+
+def report_missing(app, exception):
+    missing = getattr(app, "golang_missing", None)
+    if exception is not None or missing is None:
+        return
+    lines = missing.report()
+    if lines:
+        references = sum(
+            entry[0] for entry in missing.targets.values() if entry is not None
+        )
+        logger.warning(
+            _("%d unresolved Go references to %d targets:\n  %s"),
+            references,
+            len(lines),
+            "\n  ".join(lines),
+            type="ref",
+            subtype="go",
+        )
+    app.golang_missing = None
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.profiling
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Opt-in counters and timers for the work of the Go domain.
+
+    With ``golang_profile = True`` every build writes a JSON report to
+    ``golang-profile.json`` in the output directory, with the number of
+    calls and cumulative time of each instrumented operation, the slowest
+    signatures and the most often missed cross-reference targets.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import collections
+import functools
+import heapq
+import io
+import json
+import os
+import time
+
+from sphinx.locale import _
+from sphinx.util import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+#: How many of the slowest signatures and missed targets are reported.
+REPORT_SIZE = 20
+
+
+class Profile(object):
+    """
+    Counters and cumulative times of named operations.
+
+    A profile belongs to the process that created it: forked parallel
+    readers start their own, which are merged back with :meth:`merge`.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.timers = {}  # name -> [calls, seconds]
+        self.counters = collections.Counter()
+        self.slowest = []  # heap of the (seconds, signature) taking longest
+        self.missed = collections.Counter()  # xref target -> misses
+
+    def add_time(self, name, seconds):
+        timer = self.timers.setdefault(name, [0, 0.0])
+        timer[0] += 1
+        timer[1] += seconds
+
+    def note_signature(self, sig, seconds):
+        if len(self.slowest) < REPORT_SIZE:
+            heapq.heappush(self.slowest, (seconds, sig))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, sig))
+
+    def note_xref(self, target, found):
+        if found:
+            self.counters["resolve_xref hits"] += 1
+        else:
+            self.counters["resolve_xref misses"] += 1
+            self.missed[target] += 1
+
+    def merge(self, other):
+        for name, (calls, seconds) in other.timers.items():
+            timer = self.timers.setdefault(name, [0, 0.0])
+            timer[0] += calls
+            timer[1] += seconds
+        self.counters.update(other.counters)
+        for seconds, sig in other.slowest:
+            self.note_signature(sig, seconds)
+        self.missed.update(other.missed)
+
+    def report(self):
+        """Return the profile as a dict ready to be dumped as JSON."""
+        return {
+            "timers": dict(
+                (name, {"calls": calls, "seconds": round(seconds, 6)})
+                for name, (calls, seconds) in sorted(self.timers.items())
+            ),
+            "counters": dict(sorted(self.counters.items())),
+            "slowest_signatures": [
+                {"signature": sig, "seconds": round(seconds, 6)}
+                for seconds, sig in sorted(self.slowest, reverse=True)
+            ],
+            "most_missed_targets": [
+                {"target": target, "misses": misses}
+                for target, misses in sorted(
+                    self.missed.items(), key=lambda item: (-item[1], item[0])
+                )[:REPORT_SIZE]
+            ],
+        }
+
+
+def get_profile(env):
+    """Return the profile of the build of *env*, or None if profiling is off."""
+    app = env._app if hasattr(env, "_app") else env.app
+    profile = getattr(app, "golang_profile", None)
+    if profile is not None and profile.pid != os.getpid():
+        # a parallel reader; it only reports its own work, sent back with
+        # its environment, see merge_profile()
+        profile = app.golang_profile = env.golang_profile = Profile()
+    return profile
+
+
+def profiled(name, per_signature=False):
+    """Decorate a method of an object with an ``env`` to time its calls.
+
+    With *per_signature* the time of each call is also noted for its first
+    argument, a signature.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            profile = get_profile(self.env)
+            if profile is None:
+                return func(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                profile.add_time(name, seconds)
+                if per_signature:
+                    profile.note_signature(args[0], seconds)
+
+        return wrapper
+
+    return decorator
+
+
+def init_profile(app):
+    # profiles are per build, kept off the environment to never be pickled
+    # with it
+    app.golang_profile = Profile() if app.config.golang_profile else None
+
+
+def merge_profile(app, env, docnames, other):
+    profile = get_profile(env)
+    if profile is not None and getattr(other, "golang_profile", None) is not None:
+        profile.merge(other.golang_profile)
+
+
+def write_profile(app, exception):
+    profile = getattr(app, "golang_profile", None)
+    if exception is not None or profile is None:
+        return
+    filename = os.path.join(app.outdir, "golang-profile.json")
+    with io.open(filename, "w", encoding="utf-8") as f:
+        f.write(json.dumps(profile.report(), indent=2, sort_keys=True))
+    app.golang_profile = None
+    logger.info(_("Golang profile written to %s"), filename)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.reuse
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Incremental builds of Go API pages by content instead of by mtime.
+
+    For every document using the Go domain a hash of its source and of the
+    files it depends on, such as the Go sources of ``go:autopackage``, is
+    kept with the identifiers its Go references are made of.  Then
+
+    * documents whose mtime changed but whose hash did not, and whose
+      doctree is still there, are not read again, and
+    * documents referring to an identifier whose Go objects were added,
+      removed or moved to another document are written again, with their
+      references resolved again, but not read.
+
+    ``golang_reuse_unchanged = False`` turns this off.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import hashlib
+import os
+import re
+
+from sphinx import addnodes
+from sphinx.environment import CONFIG_OK
+from sphinx.util import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+ident_re = re.compile(r"[^\W\d]\w*")
+
+#: The key of documents depending on every Go object, like those with a
+#: method set, whose content depends on other types.
+ANY = "*"
+
+
+def document_hash(env, docname):
+    """Return the hash of the source of *docname* and its dependencies."""
+    digest = hashlib.sha1()
+    filenames = [env.doc2path(docname)]
+    filenames += sorted(
+        os.path.join(env.srcdir, dep) for dep in env.dependencies.get(docname, ())
+    )
+    for filename in filenames:
+        digest.update(os.fspath(filename).encode("utf-8", "replace") + b"\0")
+        try:
+            with open(filename, "rb") as f:
+                digest.update(f.read())
+        except (IOError, OSError):
+            digest.update(b"\1missing")
+    return digest.hexdigest()
+
+
+def reference_keys(target):
+    """Return the identifiers of the reference *target*."""
+    return ident_re.findall(target)
+
+
+def _mtime_changed_only(env, docname):
+    # Sphinx also marks documents changed to read them always or because
+    # their doctree is missing, which the hash knows nothing about
+    return docname not in env.reread_always and os.path.exists(
+        os.path.join(env.doctreedir, docname + ".doctree")
+    )
+
+
+def note_document(app, doctree):
+    """Keep the hash and reference keys of a document using the Go domain."""
+    env = app.env
+    domain = env.get_domain("go")
+    keys = []
+    findall = getattr(doctree, "findall", None) or doctree.traverse
+    for node in findall(addnodes.pending_xref):
+        if node.get("refdomain") == "go" or node.get("reftype") == "any":
+            keys.extend(reference_keys(node["reftarget"]))
+    if keys:
+        domain.note_references(env.docname, keys)
+    if domain.uses_domain(env.docname):
+        domain.note_inputs(env.docname, document_hash(env, env.docname))
+
+
+def skip_unchanged(app, env, added, changed, removed):
+    """Do not read documents again whose Go inputs are unchanged."""
+    domain = env.get_domain("go")
+    if app.config.golang_reuse_unchanged and env.config_status == CONFIG_OK:
+        unchanged = set(
+            docname
+            for docname in changed
+            if _mtime_changed_only(env, docname)
+            and domain.get_inputs(docname) == document_hash(env, docname)
+        )
+        if unchanged:
+            # Sphinx reads the changed documents of this very set
+            changed.difference_update(unchanged)
+            logger.info("[golang: %d unchanged] ", len(unchanged), nonl=True)
+    domain.note_reading(added | changed | removed)
+    return []
+
+
+def find_moved_references(app, env):
+    """Return the documents whose Go references may resolve differently."""
+    if not app.config.golang_reuse_unchanged:
+        return []
+    domain = env.get_domain("go")
+    keys = domain.get_moved_keys()
+    if not keys:
+        return []
+    keys.add(ANY)
+    return [
+        docname
+        for docname, refs in domain.iter_reference_keys()
+        if not keys.isdisjoint(refs)
+    ]
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.search
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A compact search index of the Go symbols, apart from Sphinx's own.
+
+    With ``golang_search_index = True`` HTML builds write the symbols to
+    ``_static/golang-search/``, sharded by the first characters of their
+    lower-cased names, so ``golang-search.js`` only fetches the shard of
+    what is typed.  A shard lists its symbols sorted by name, with names
+    and fullnames front-coded, that is stored as the length of the prefix
+    shared with the previous one and the rest, and documents and objtypes
+    as indices into the tables of the manifest, ``index.js``.
+
+    Files are only written when their content changes.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import io
+import json
+import os
+import shutil
+
+from sphinx.locale import _
+from sphinx.util import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+#: How many characters of the lower-cased names select their shard.
+SHARD_PREFIX = 2
+
+static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def search_name(fullname, objtype):
+    """Return the name a symbol is searched by, e.g. ``Push`` for
+    ``(acme/list.*List) Push`` and ``list`` for the package ``acme/list``.
+    """
+    if objtype == "package":
+        return fullname.rpartition("/")[2]
+    if fullname.startswith("("):
+        return fullname.rpartition(" ")[2]
+    return fullname.rpartition(".")[2]
+
+
+def shard_key(name):
+    return name[:SHARD_PREFIX].lower()
+
+
+def shard_filename(key):
+    # keys are any characters of Go identifiers; golang-search.js does the same
+    return key.encode("utf-8").hex() + ".js"
+
+
+def front_code(previous, string):
+    """Return ``[n, rest]`` where *string* is the first *n* characters of
+    *previous* followed by *rest*.
+    """
+    n = 0
+    for a, b in zip(previous, string):
+        if a != b:
+            break
+        n += 1
+    return [n, string[n:]]
+
+
+def iter_shards(objects, documents, objtypes):
+    """Yield the ``(key, rows)`` of the shards of *objects*.
+
+    *objects* are the ``(fullname, objtype, docname)`` of the symbols;
+    *documents* and *objtypes* map docnames and objtypes to their index.
+    """
+    symbols = sorted(
+        (shard_key(name), name.lower(), name, fullname, objtype, docname)
+        for fullname, objtype, docname in objects
+        for name in (search_name(fullname, objtype),)
+    )
+    key = None
+    rows = []
+    for symbol_key, _lower, name, fullname, objtype, docname in symbols:
+        if symbol_key != key:
+            if rows:
+                yield key, rows
+            key = symbol_key
+            rows = []
+            prev_name = prev_fullname = ""
+        rows.append(
+            front_code(prev_name, name)
+            + front_code(prev_fullname, fullname)
+            + [objtypes[objtype], documents[docname]]
+        )
+        prev_name, prev_fullname = name, fullname
+    if rows:
+        yield key, rows
+
+
+def _write_if_changed(filename, text):
+    try:
+        with io.open(filename, encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except (IOError, OSError):
+        pass
+    with io.open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+
+def _dump(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_search_index(app, exception):
+    if (
+        exception is not None
+        or not app.config.golang_search_index
+        or app.builder.format != "html"
+    ):
+        return
+    domain = app.env.get_domain("go")
+    objects = [
+        (fullname, objtype, docname)
+        for fullname, _dispname, objtype, docname, _anchor, _prio in (
+            domain.get_objects()
+        )
+    ]
+    docnames = sorted(set(docname for _fullname, _objtype, docname in objects))
+    documents = dict((docname, i) for i, docname in enumerate(docnames))
+    objtype_names = sorted(domain.object_types)
+    objtypes = dict((objtype, i) for i, objtype in enumerate(objtype_names))
+
+    dirname = os.path.join(app.outdir, "_static", "golang-search")
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    stale = set(name for name in os.listdir(dirname) if name != "index.js")
+    written = 0
+    shards = {}
+    for key, rows in iter_shards(objects, documents, objtypes):
+        filename = shard_filename(key)
+        stale.discard(filename)
+        shards[key] = len(rows)
+        text = "GolangSearch.setShard(%s, %s);\n" % (_dump(key), _dump(rows))
+        written += _write_if_changed(os.path.join(dirname, filename), text)
+    for filename in stale:
+        os.remove(os.path.join(dirname, filename))
+
+    manifest = {
+        "prefix": SHARD_PREFIX,
+        "documents": [app.builder.get_target_uri(docname) for docname in docnames],
+        "objtypes": objtype_names,
+        "shards": shards,
+    }
+    text = "GolangSearch.setManifest(%s);\n" % _dump(manifest)
+    written += _write_if_changed(os.path.join(dirname, "index.js"), text)
+    shutil.copyfile(
+        os.path.join(static_dir, "golang-search.js"),
+        os.path.join(app.outdir, "_static", "golang-search.js"),
+    )
+    logger.info(
+        _("Golang search index: %d symbols in %d shards, %d files written"),
+        len(objects),
+        len(shards),
+        written,
+    )
+
+
+def init_search_index(app):
+    if app.config.golang_search_index and app.builder.format == "html":
+        app.add_js_file("golang-search.js")
@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.signature
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A single pass parser for Go function signatures.
+
+    Signatures without type parameters and with brackets nested at most
+    once, most of them, are matched by regexes, and the parameters and
+    results following their names are parsed once, as the same ones come
+    back again and again.  The others go through :class:`SignatureParser`.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import collections
+import functools
+import re
+
+
+ws_re = re.compile(r"\s*")
+func_re = re.compile(r"\s*func(?!\w)")
+name_re = re.compile(r"[^\s(\[]*\w")
+# the only characters that matter inside a type expression
+delim_re = re.compile(r"[()\[\]{},\"`]")
+nested_re = re.compile(r"[()\[\]{}\"`]")
+string_re = re.compile(r"\"(?:[^\"\\]|\\.)*\"|`[^`]*`")
+ident_re = re.compile(r"^[^\W\d]\w*$")
+ident_end_re = re.compile(r"\w")
+
+# square brackets holding no commas, unlike "Map[K, V]", the parentheses
+# of a function type like "func(a, b int) error", without brackets nested
+# any further, and the braces of "interface{}"
+flat_index = r"""\[[^(){}"`\[\],]*\]"""
+flat_nested = r"""%s | \( [^(){}"`\[\]]* (?: %s [^(){}"`\[\]]* )* \) | \{\}""" % (
+    flat_index,
+    flat_index,
+)
+# a list of parameters, and a single type, without commas at all
+flat_list = r"""[^(){}"`\[\]]* (?: (?:%s) [^(){}"`\[\]]* )*""" % flat_nested
+flat_type = r"""[^(){}"`,\[\]]* (?: (?:%s) [^(){}"`,\[\]]* )*""" % flat_nested
+
+# signatures without type parameters, their parameters and results left
+# to flat_tail_re
+flat_func_re = re.compile(
+    r"""^\s* func (?!\w) \s*
+         (?: \( ([^(){}\[\]"`,]*) \) \s* )?       # receiver
+         ([^\s(\[]*\w) \s*                        # name
+         (\(.*)                                   # parameters and results
+    """,
+    re.VERBOSE,
+)
+# parameters and results with brackets nested at most once; every group
+# excludes the delimiter that ends it, so matching never backtracks
+flat_tail_re = re.compile(
+    r"""\( (%s) \) \s*                            # parameters
+         (?: \( (%s) \)                            # results
+           | (?=[^\s(]) (%s) )? \s* $
+    """
+    % (flat_list, flat_list, flat_type),
+    re.VERBOSE,
+)
+# the commas of a list matched by flat_tail_re that are not in parentheses
+top_comma_re = re.compile(r",(?![^(]*\))")
+
+# type expressions starting with these are never parameter names
+keywords = set(("chan", "func", "interface", "map", "struct"))
+
+#: Go's predeclared types, which are not documented anywhere.
+predeclared = frozenset(
+    (
+        "any",
+        "bool",
+        "byte",
+        "comparable",
+        "complex64",
+        "complex128",
+        "error",
+        "float32",
+        "float64",
+        "int",
+        "int8",
+        "int16",
+        "int32",
+        "int64",
+        "rune",
+        "string",
+        "uint",
+        "uint8",
+        "uint16",
+        "uint32",
+        "uint64",
+        "uintptr",
+    )
+)
+
+# names in type expressions, qualified ones like "io.Reader" included, and
+# the string literals of struct tags; names followed by the start of a type
+# or by "(", and lists of names starting a list followed by a type, are
+# parameter, field or method names
+type_token_re = re.compile(
+    r"""\"(?:[^\"\\]|\\.)*\" | `[^`]*`
+      | (?:(?<=[(,;{])|(?<=[(,;{]\s))
+        (?P<names>[^\W\d]\w*(?:\s*,\s*[^\W\d]\w*)+) (?=\s+[\w*\[(.<])
+      | (?P<name>[^\W\d]\w*(?:\.[^\W\d]\w*)?) (?P<declared>(?=\s+[\w*\[(.<]|\())?
+    """,
+    re.VERBOSE,
+)
+
+brackets = {"(": ")", "[": "]", "{": "}"}
+
+#: A group of parameters sharing a type, e.g. ``a, b int``.  ``names`` is
+#: empty for unnamed parameters and results.
+Param = collections.namedtuple("Param", ["names", "type"])
+
+#: A parsed function signature.  ``receiver`` is a :class:`Param` or None,
+#: the other fields are tuples of :class:`Param`.
+FuncSignature = collections.namedtuple(
+    "FuncSignature", ["receiver", "name", "type_params", "params", "results"]
+)
+
+
+# tuple.__new__(Param, ...) skips the argument handling of Param(...), which
+# takes longer than looking a parsed list up
+new_tuple = tuple.__new__
+
+
+class SignatureError(ValueError):
+    """Raised for signatures the parser does not understand."""
+
+
+class SignatureParser(object):
+    """
+    Parser for ``func [(recv)] Name[[TypeParams]](Params) [Results]``.
+
+    The parser only moves forward.  Inside type expressions it jumps from
+    one bracket, comma or string literal to the next, so the work done is
+    linear in the length of the signature; type expressions are kept as
+    the source text they were written as.
+    """
+
+    def __init__(self, sig):
+        self.sig = sig
+        self.pos = 0
+
+    def fail(self, message):
+        raise SignatureError("%s in Go signature %r" % (message, self.sig))
+
+    def peek(self):
+        self.pos = ws_re.match(self.sig, self.pos).end()
+        return self.sig[self.pos : self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            self.fail("expected %r" % char)
+        self.pos += 1
+
+    def parse_function(self):
+        m = func_re.match(self.sig)
+        if m is None:
+            self.fail("expected 'func'")
+        self.pos = m.end()
+
+        receiver = None
+        if self.peek() == "(":
+            receivers = self.parse_params("(", ")")
+            if len(receivers) != 1 or len(receivers[0].names) > 1:
+                self.fail("expected a single receiver")
+            receiver = receivers[0]
+
+        name = self.parse_name()
+        type_params = ()
+        if self.peek() == "[":
+            type_params = self.parse_params("[", "]")
+        params = self.parse_params("(", ")")
+
+        char = self.peek()
+        if char == "(":
+            results = self.parse_params("(", ")")
+        elif not char:
+            results = ()
+        else:
+            results = (Param((), self.parse_type()),)
+        if self.peek():
+            self.fail("unexpected %r" % self.peek())
+        return FuncSignature(receiver, name, type_params, params, results)
+
+    def parse_name(self):
+        # a name, optionally qualified with a package or import path
+        self.peek()
+        m = name_re.match(self.sig, self.pos)
+        if m is None:
+            self.fail("expected a name")
+        self.pos = m.end()
+        return m.group()
+
+    def parse_type(self):
+        # everything up to a "," or closing bracket on the same level
+        start = self.pos
+        closers = []
+        while True:
+            m = delim_re.search(self.sig, self.pos)
+            if m is None:
+                self.pos = len(self.sig)
+                break
+            char = m.group()
+            self.pos = m.end()
+            if char in brackets:
+                closers.append(brackets[char])
+            elif char in '"`':
+                m = string_re.match(self.sig, m.start())
+                if m is None:
+                    self.fail("unterminated string")
+                self.pos = m.end()
+            elif closers and char == closers[-1]:
+                closers.pop()
+            elif not closers and char in ",)]":
+                self.pos = m.start()
+                break
+        if closers:
+            self.fail("unbalanced brackets")
+        typ = self.sig[start : self.pos].strip()
+        if not typ:
+            self.fail("expected a type")
+        return typ
+
+    def parse_params(self, opening, closing):
+        self.expect(opening)
+        end = self.sig.find(closing, self.pos)
+        if end != -1 and nested_re.search(self.sig, self.pos, end) is None:
+            # the common case of a flat list, without nested brackets
+            text = self.sig[self.pos : end]
+            self.pos = end + 1
+            parse = flat_params
+        else:
+            text = self.split_list(closing)
+            parse = split_params
+        try:
+            return parse(text)
+        except SignatureError as exc:
+            self.fail(exc.args[0])
+
+    def split_list(self, closing):
+        # the elements of the list up to closing, split at its commas
+        sig = self.sig
+        parts = []
+        start = pos = self.pos
+        closers = []
+        while True:
+            m = delim_re.search(sig, pos)
+            if m is None:
+                self.fail("unbalanced brackets")
+            char = m.group()
+            pos = m.end()
+            if char in brackets:
+                closers.append(brackets[char])
+            elif char in '"`':
+                m = string_re.match(sig, m.start())
+                if m is None:
+                    self.fail("unterminated string")
+                pos = m.end()
+            elif closers:
+                if char == closers[-1]:
+                    closers.pop()
+            elif char == ",":
+                parts.append(sig[start : m.start()])
+                start = pos
+            elif char == closing:
+                parts.append(sig[start : m.start()])
+                self.pos = pos
+                return parts
+            else:
+                self.fail("expected %r" % closing)
+
+
+def split_params(parts):
+    """Return the :class:`Param` of a list of parameters split into the
+    texts *parts* of its elements, a trailing comma giving an empty one.
+    """
+    if len(parts) > 1 and not parts[-1].strip():
+        parts.pop()
+    params = []
+    unnamed = 0
+    for part in parts:
+        # a name is an identifier followed by a type, unlike "chan int"
+        words = part.split(None, 1)
+        if len(words) == 2 and words[0].isidentifier() and words[0] not in keywords:
+            params.append(new_tuple(Param, ((words[0],), words[1].rstrip())))
+        elif words:
+            params.append(new_tuple(Param, ((), part.strip())))
+            unnamed += 1
+        elif len(parts) > 1:
+            raise SignatureError("expected a type")
+    if unnamed and unnamed < len(params):
+        return group_params(params)
+    return tuple(params)
+
+
+def flat_params(text):
+    """Parse the list *text* of parameters without nested brackets.
+
+    Returns a tuple of :class:`Param`.  Parentheses may nest once, as in
+    ``f func(a, b int)``.
+    """
+    if "(" in text:
+        return split_params(top_comma_re.split(text))
+    return split_params(text.split(","))
+
+
+def group_params(params):
+    """Give the names of unnamed :class:`Param` to the named one following
+    them, as in ``a, b int``, which requires all parameters to be named.
+    """
+    grouped = []
+    names = []
+    for param in params:
+        if not param.names:
+            if not ident_re.match(param.type):
+                raise SignatureError("mixed named and unnamed parameters")
+            names.append(param.type)
+        elif names:
+            grouped.append(Param(tuple(names) + param.names, param.type))
+            names = []
+        else:
+            grouped.append(param)
+    if names:
+        raise SignatureError("mixed named and unnamed parameters")
+    return tuple(grouped)
+
+
+@functools.lru_cache(maxsize=4096)
+def flat_receiver(text):
+    """Return the :class:`Param` of the receiver *text* of a method."""
+    receivers = flat_params(text)
+    if len(receivers) != 1 or len(receivers[0].names) > 1:
+        raise SignatureError("expected a single receiver")
+    return receivers[0]
+
+
+@functools.lru_cache(maxsize=16384)
+def flat_tail(text):
+    """Parse the parameters and results *text* following the name of a
+    function, or return None if its brackets nest too deep.
+
+    Returns a tuple of the parameters and the results.  Most functions
+    share theirs with others, like ``(b []byte) (n int, err error)``, so
+    the result is cached, with room for the 15800 of the standard library.
+    """
+    m = flat_tail_re.match(text)
+    if m is None:
+        return None
+    params, results, result = m.groups()
+    if results is not None:
+        return flat_params(params), flat_params(results)
+    elif result is not None:
+        return flat_params(params), (new_tuple(Param, ((), result.strip())),)
+    return flat_params(params), ()
+
+
+def parse_function(sig):
+    """Parse the Go function signature *sig* into a :class:`FuncSignature`.
+
+    Raises :exc:`SignatureError` if *sig* is not a valid signature.
+    """
+    m = flat_func_re.match(sig)
+    if m is not None:
+        # the signatures of most functions, whose parameters and results
+        # come back again and again
+        receiver, name, tail = m.groups()
+        try:
+            if receiver is not None:
+                receiver = flat_receiver(receiver)
+            tail = flat_tail(tail)
+            if tail is not None:
+                return new_tuple(FuncSignature, (receiver, name, ()) + tail)
+        except SignatureError as exc:
+            raise SignatureError("%s in Go signature %r" % (exc.args[0], sig))
+    # nested brackets or type parameters
+    return SignatureParser(sig).parse_function()
+
+
+def is_function(sig):
+    """Tell whether *sig* is written as a function signature."""
+    return func_re.match(sig) is not None
+
+
+def format_params(params):
+    return ", ".join(
+        " ".join((", ".join(param.names), param.type)) if param.names else param.type
+        for param in params
+    )
+
+
+def format_results(results):
+    """Format *results* as they would be written after the parameters."""
+    if len(results) == 1 and not results[0].names:
+        return results[0].type
+    return "(%s)" % format_params(results) if results else ""
+
+
+@functools.lru_cache(maxsize=4096)
+def tokenize_type(typ):
+    """Split the type expression *typ* into ``(text, name)`` tokens.
+
+    ``name`` is the type name, possibly qualified with a package, that the
+    text of a token refers to, or None for the text between names.  Keywords
+    and predeclared types are no names, so ``map[string]io.Reader`` gives
+    ``("map[string]", None), ("io.Reader", "io.Reader")``.
+    """
+    tokens = []
+    pos = 0
+    for m in type_token_re.finditer(typ):
+        name = m.group("name")
+        if name is None or m.group("declared") is not None:
+            continue
+        if name in keywords or name in predeclared:
+            continue
+        if m.start() > pos:
+            tokens.append((typ[pos : m.start()], None))
+        tokens.append((name, name))
+        pos = m.end()
+    if pos < len(typ):
+        tokens.append((typ[pos:], None))
+    return tuple(tokens)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_type_params(text):
+    """Parse the type parameter list *text*, e.g. ``[K comparable, V any]``.
+
+    Returns a tuple of :class:`Param`.  The result is cached, so every
+    declaration with the same list shares it.
+    """
+    parser = SignatureParser(text)
+    params = parser.parse_params("[", "]")
+    if parser.peek():
+        parser.fail("unexpected %r" % parser.peek())
+    return params
+
+
+def type_params_end(sig, pos):
+    """Return where the type parameter list starting at *pos* of *sig* ends."""
+    parser = SignatureParser(sig)
+    parser.pos = pos
+    parser.parse_params("[", "]")
+    return parser.pos
+
+
+@functools.lru_cache(maxsize=4096)
+def split_type_args(typ):
+    """Split the type *typ* into its name and its type arguments.
+
+    ``*List[K, V]`` gives ``("*List", ("K", "V"))``, types that are not
+    instantiated have no arguments.
+    """
+    start = typ.find("[")
+    if start <= 0 or not typ.endswith("]") or not ident_end_re.match(typ, start - 1):
+        # not generic, or a slice or array type like "[]T"
+        return typ, ()
+    parser = SignatureParser(typ)
+    parser.pos = start
+    try:
+        args = parser.parse_params("[", "]")
+    except SignatureError:
+        return typ, ()
+    if parser.peek():
+        return typ, ()
+    return typ[:start], tuple(format_params((arg,)) for arg in args)
+
+
+@functools.lru_cache(maxsize=4096)
+def strip_type_args(name):
+    """Remove the type arguments from the reference *name*.
+
+    ``List[int]`` refers to ``List`` and ``Map[K, V].Get`` to ``Map.Get``.
+    """
+    if "[" not in name:
+        return name
+    parts = []
+    depth = start = 0
+    for i, char in enumerate(name):
+        if char == "[":
+            if depth == 0:
+                parts.append(name[start:i])
+            depth += 1
+        elif char == "]" and depth:
+            depth -= 1
+            if depth == 0:
+                start = i + 1
+    if depth:
+        return name
+    parts.append(name[start:])
+    return "".join(parts)
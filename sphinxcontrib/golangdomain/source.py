@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.source
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Extraction of exported declarations and doc comments from Go sources.
+
+    The scanner does not need a Go toolchain: it only tracks brackets,
+    comments and string literals, which is enough to find the top-level
+    declarations of gofmt'ed code.  Declarations come out as records in the
+    format read by :mod:`sphinxcontrib.golangdomain.symbols`.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import bisect
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import textwrap
+
+from .signature import SignatureError, parse_function, type_params_end
+
+
+#: Bump whenever the scanner's output changes, to invalidate caches.
+SCANNER_VERSION = 2
+
+token_re = re.compile(
+    r"""//[^\n]*
+      | /\*.*?\*/
+      | "(?:[^"\\\n]|\\.)*"
+      | `[^`]*`
+      | '(?:[^'\\\n]|\\.)*'
+      | [{}()\[\]\n]
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+comment_re = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+package_re = re.compile(r"package\s+(\w+)")
+spec_names_re = re.compile(r"[^\W\d]\w*(?:\s*,\s*[^\W\d]\w*)*")
+# "//go:generate" and friends are not part of the documentation
+directive_re = re.compile(r"//(?:go:|line |export |extern )")
+
+openers = "([{"
+
+# godoc's order of declarations
+kind_order = {"const": 0, "var": 1, "func": 2, "type": 3, "method": 3}
+
+
+def is_exported(name):
+    return name[:1].isupper()
+
+
+class _Line(object):
+    """A line starting outside of comments and string literals."""
+
+    __slots__ = ("start", "depth", "group")
+
+    def __init__(self, start, depth, group):
+        self.start = start
+        self.depth = depth
+        # the keyword of the declaration group the line is directly in
+        self.group = group
+
+
+def _split(text):
+    """Return the lines of *text* and the offsets of top-level braces."""
+    lines = [_Line(0, 0, None)]
+    braces = []
+    depth = 0
+    group = None
+    for m in token_re.finditer(text):
+        token = m.group()
+        if token == "\n":
+            lines.append(_Line(m.end(), depth, group if depth == 1 else None))
+        elif token in openers:
+            if depth == 0:
+                if token == "{":
+                    braces.append(m.start())
+                elif token == "(":
+                    keyword = text[lines[-1].start : m.start()].strip()
+                    if keyword in ("const", "var", "type"):
+                        group = keyword
+            depth += 1
+        elif token in ")]}":
+            depth = max(depth - 1, 0)
+            if depth == 0:
+                group = None
+    return lines, braces
+
+
+def _first_line(text, start):
+    end = text.find("\n", start)
+    return text[start:] if end == -1 else text[start:end]
+
+
+def _end(text, lines, i):
+    # a declaration ends where the next one on the same level starts
+    depth = lines[i].depth
+    for j in range(i + 1, len(lines)):
+        if lines[j].depth <= depth:
+            return lines[j].start
+    return len(text)
+
+
+def _doc(comments):
+    text = []
+    for comment in comments:
+        if directive_re.match(comment):
+            continue
+        comment = comment[2:]
+        text.append(comment[1:] if comment[:1] == " " else comment)
+    return "\n".join(text).strip("\n")
+
+
+def _collapse(text):
+    text = " ".join(comment_re.sub(" ", text).split())
+    # undo the line breaks of multi-line parameter lists
+    return re.sub(r",? ([)\]])", r"\1", re.sub(r"([(\[]) ", r"\1", text))
+
+
+def scan_source(text):
+    """Scan the Go source *text*.
+
+    Returns a dict with the ``package`` name, the package ``doc`` and the
+    exported ``decls`` as records lacking the package key.
+    """
+    lines, braces = _split(text)
+    result = {"package": None, "doc": "", "decls": []}
+    decls = result["decls"]
+    comments = []
+
+    for i, line in enumerate(lines):
+        first = _first_line(text, line.start).strip()
+
+        if line.depth == 0 or (line.depth == 1 and line.group):
+            if first.startswith("//"):
+                comments.append(first)
+                continue
+            if not first or first.startswith(")"):
+                comments = []
+                continue
+
+        if line.depth == 0:
+            keyword = first.split(None, 1)[0]
+            if keyword == "package":
+                m = package_re.match(first)
+                if m is not None:
+                    result["package"] = m.group(1)
+                    result["doc"] = _doc(comments)
+            elif keyword == "func":
+                end = _end(text, lines, i)
+                decl = _scan_func(text, line.start, end, braces, comments)
+                if decl is not None:
+                    decls.append(decl)
+            elif keyword in ("const", "var", "type") and not first.endswith("("):
+                spec = first[len(keyword) :]
+                source = text[line.start : _end(text, lines, i)]
+                decls.extend(_scan_spec(keyword, spec, source, comments))
+        elif line.depth == 1 and line.group:
+            source = text[line.start : _end(text, lines, i)]
+            decls.extend(_scan_spec(line.group, first, source, comments))
+        comments = []
+    return result
+
+
+def _func_signature(text, start, end, braces):
+    # the signature ends at the brace opening the body, if there is one;
+    # braces of interface{} and struct{} result types are part of it
+    i = bisect.bisect_left(braces, start)
+    stop = end
+    while i < len(braces) and braces[i] < end:
+        if not text[start : braces[i]].rstrip().endswith(("interface", "struct")):
+            stop = braces[i]
+            break
+        i += 1
+    return _collapse(text[start:stop])
+
+
+def func_signatures(text):
+    """Yield the signatures of the functions and methods in the Go source
+    *text*, exported or not, as the scanner passes them to the parser.
+    """
+    lines, braces = _split(text)
+    for i, line in enumerate(lines):
+        first = _first_line(text, line.start)
+        if line.depth == 0 and first.startswith(("func ", "func(")):
+            yield _func_signature(text, line.start, _end(text, lines, i), braces)
+
+
+def _scan_func(text, start, end, braces, comments):
+    sig = _func_signature(text, start, end, braces)
+    try:
+        func = parse_function(sig)
+    except SignatureError:
+        return None
+    if not is_exported(func.name):
+        return None
+    if func.receiver is not None:
+        typ = func.receiver.type.lstrip("*").split("[", 1)[0]
+        if not is_exported(typ):
+            return None
+        return {
+            "kind": "method",
+            "name": func.name,
+            "receiver": typ,
+            "signature": sig,
+            "doc": _doc(comments),
+        }
+    return {"kind": "func", "name": func.name, "signature": sig, "doc": _doc(comments)}
+
+
+def _scan_spec(keyword, spec, source, comments):
+    spec = spec.strip()
+    m = spec_names_re.match(spec)
+    if m is None:
+        return []
+    decl = source.rstrip()
+    if not decl.startswith(keyword):
+        # a spec inside a declaration group
+        decl = "%s %s" % (keyword, textwrap.dedent(decl).lstrip())
+    records = [
+        {"kind": keyword, "name": name, "doc": _doc(comments), "decl": decl}
+        for name in re.split(r"\s*,\s*", m.group())
+        if is_exported(name)
+    ]
+    if keyword == "type" and records and spec[m.end() : m.end() + 1] == "[":
+        # a generic type; its signature has the type parameters, which may
+        # span several lines
+        spec = _collapse(decl[len(keyword) :])
+        try:
+            end = type_params_end(spec, m.end())
+        except SignatureError:
+            return records
+        records[0]["signature"] = spec[:end]
+    return records
+
+
+class SourceCache(object):
+    """
+    On-disk cache of :func:`scan_source` results, one file per Go source.
+
+    An entry is reused without reading the source while its mtime and size
+    are unchanged, and without rescanning it while its content hash is.
+    Entries are replaced atomically, so parallel readers are safe.
+    """
+
+    def __init__(self, dirname):
+        self.dirname = dirname
+
+    def _entry_filename(self, filename):
+        key = hashlib.sha1(filename.encode("utf-8")).hexdigest()
+        return os.path.join(self.dirname, key + ".json")
+
+    def _load(self, entry_filename):
+        try:
+            with io.open(entry_filename, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if entry.get("version") != SCANNER_VERSION:
+            return None
+        return entry
+
+    def _store(self, entry_filename, entry):
+        try:
+            if not os.path.isdir(self.dirname):
+                os.makedirs(self.dirname)
+            fd, tmpname = tempfile.mkstemp(dir=self.dirname, suffix=".tmp")
+            with io.open(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmpname, entry_filename)
+        except (IOError, OSError):
+            # the cache is an optimization only
+            pass
+
+    def scan(self, filename):
+        """Return the :func:`scan_source` result for *filename*."""
+        filename = os.path.abspath(filename)
+        st = os.stat(filename)
+        entry_filename = self._entry_filename(filename)
+        entry = self._load(entry_filename)
+        if (
+            entry is not None
+            and entry["filename"] == filename
+            and entry["mtime"] == st.st_mtime_ns
+            and entry["size"] == st.st_size
+        ):
+            return entry["result"]
+
+        with io.open(filename, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if entry is None or entry["filename"] != filename or entry["hash"] != digest:
+            result = scan_source(data.decode("utf-8", "replace"))
+        else:
+            result = entry["result"]
+        self._store(
+            entry_filename,
+            {
+                "version": SCANNER_VERSION,
+                "filename": filename,
+                "mtime": st.st_mtime_ns,
+                "size": st.st_size,
+                "hash": digest,
+                "result": result,
+            },
+        )
+        return result
+
+
+def _scan(task):
+    cachedir, filename = task
+    if cachedir is None:
+        with io.open(filename, encoding="utf-8", errors="replace") as f:
+            return scan_source(f.read())
+    return SourceCache(cachedir).scan(filename)
+
+
+def scan_files(filenames, cachedir=None, workers=1):
+    """Scan *filenames*, in a pool of *workers* processes if more than one.
+
+    The results are in the order of *filenames* whatever the number of
+    workers, so everything built from them is reproducible.
+    """
+    tasks = [(cachedir, filename) for filename in filenames]
+    if workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            return list(executor.map(_scan, tasks, chunksize=chunksize))
+    return [_scan(task) for task in tasks]
+
+
+def package_dirs(root):
+    """Return the sorted directories below *root* that hold Go packages.
+
+    Like the go tool, ``testdata`` and ``vendor`` directories and those
+    starting with ``.`` or ``_`` are skipped.
+    """
+    result = []
+    for dirname, subdirs, filenames in os.walk(root):
+        subdirs[:] = sorted(
+            subdir
+            for subdir in subdirs
+            if subdir not in ("testdata", "vendor") and subdir[:1] not in "._"
+        )
+        if any(
+            name.endswith(".go") and not name.endswith("_test.go")
+            for name in filenames
+        ):
+            result.append(dirname)
+    return sorted(result)
+
+
+def package_files(dirname):
+    """Return the sorted paths of the non-test Go files in *dirname*."""
+    return sorted(
+        os.path.join(dirname, name)
+        for name in os.listdir(dirname)
+        if name.endswith(".go") and not name.endswith("_test.go")
+    )
+
+
+def package_records(results, import_path=None):
+    """Merge the scan *results* of a package's files into symbol records.
+
+    The package record comes first, followed by the declarations in godoc
+    order.  Files of another package than most of them, such as generators
+    excluded by build tags, are left out.
+    """
+    names = [result["package"] for result in results if result["package"]]
+    if not names:
+        return []
+    pkgname = max(sorted(set(names)), key=names.count)
+    import_path = import_path or pkgname
+
+    doc = ""
+    decls = []
+    for result in results:
+        if result["package"] != pkgname:
+            continue
+        doc = doc or result["doc"]
+        decls.extend(result["decls"])
+
+    def sort_key(decl):
+        # constants and variables stay in source order
+        if decl["kind"] in ("const", "var"):
+            return (kind_order[decl["kind"]], "", 0, "")
+        if decl["kind"] == "method":
+            return (kind_order["method"], decl["receiver"], 1, decl["name"])
+        return (kind_order[decl["kind"]], decl["name"], 0, "")
+
+    records = [
+        {
+            "kind": "package",
+            "name": import_path,
+            "synopsis": doc.split(". ", 1)[0].split("\n\n", 1)[0].strip(),
+            "doc": doc,
+        }
+    ]
+    for decl in sorted(decls, key=sort_key):
+        record = dict(decl)
+        record["package"] = import_path
+        records.append(record)
+    return records
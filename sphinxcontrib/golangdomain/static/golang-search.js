@@ -0,0 +1,153 @@
+/*
+ * golang-search.js
+ * ~~~~~~~~~~~~~~~~
+ *
+ * Loader of the Go symbol search index written by
+ * sphinxcontrib.golangdomain.search: the manifest and the shard of the
+ * typed prefix are fetched on demand, once each.
+ *
+ *   GolangSearch.lookup("Rea", function (results) { ... });
+ *
+ * calls back with the symbols whose name starts with the text, as objects
+ * with a name, fullname, objtype and url.  An input element with the
+ * "golang-search" class gets a list of links to them below it.
+ *
+ * :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+ * :license: BSD, see LICENSE for details.
+ */
+
+var GolangSearch = (function () {
+  "use strict";
+
+  var script = document.currentScript;
+  var base = script ? script.src.replace(/[^\/]*$/, "") : "_static/";
+  var root = base + "../";
+  var manifest = null;
+  var shards = {};
+  var waiting = {};  // script URL -> callbacks
+
+  function load(url, callback) {
+    if (waiting[url]) {
+      waiting[url].push(callback);
+      return;
+    }
+    waiting[url] = [callback];
+    var element = document.createElement("script");
+    element.src = url;
+    element.onload = function () {
+      var callbacks = waiting[url];
+      delete waiting[url];
+      callbacks.forEach(function (cb) { cb(); });
+    };
+    document.head.appendChild(element);
+  }
+
+  function hex(key) {
+    return Array.prototype.map.call(new TextEncoder().encode(key), function (b) {
+      return ("0" + b.toString(16)).slice(-2);
+    }).join("");
+  }
+
+  // undo the front coding of the rows of a shard
+  function decode(rows) {
+    var name = "", fullname = "";
+    return rows.map(function (row) {
+      name = name.slice(0, row[0]) + row[1];
+      fullname = fullname.slice(0, row[2]) + row[3];
+      var objtype = manifest.objtypes[row[4]];
+      var anchor = objtype === "package" ? "package-" + fullname : fullname;
+      return {
+        name: name,
+        fullname: fullname,
+        objtype: objtype,
+        url: root + manifest.documents[row[5]] + "#" + encodeURI(anchor)
+      };
+    });
+  }
+
+  function withShard(key, callback) {
+    if (shards[key] !== undefined || !manifest.shards[key]) {
+      callback(shards[key] || []);
+      return;
+    }
+    load(base + "golang-search/" + hex(key) + ".js", function () {
+      callback(shards[key] || []);
+    });
+  }
+
+  function lookup(text, callback) {
+    if (!manifest) {
+      load(base + "golang-search/index.js", function () {
+        lookup(text, callback);
+      });
+      return;
+    }
+    var prefix = text.toLowerCase();
+    var keys = [prefix.slice(0, manifest.prefix)];
+    if (!prefix) {
+      callback([]);
+      return;
+    } else if (prefix.length < manifest.prefix) {
+      // too short to pick a shard, every shard it starts is needed
+      keys = Object.keys(manifest.shards).filter(function (key) {
+        return key.indexOf(prefix) === 0;
+      });
+    }
+    var results = [];
+    var pending = keys.length + 1;
+    function done() {
+      if (--pending === 0) {
+        results = results.filter(function (symbol) {
+          return symbol.name.toLowerCase().indexOf(prefix) === 0;
+        });
+        results.sort(function (a, b) {
+          var x = a.name.toLowerCase(), y = b.name.toLowerCase();
+          return x < y ? -1 : x > y ? 1 : 0;
+        });
+        callback(results);
+      }
+    }
+    keys.forEach(function (key) {
+      withShard(key, function (symbols) {
+        results = results.concat(symbols);
+        done();
+      });
+    });
+    done();
+  }
+
+  function attach(input) {
+    var list = document.createElement("ul");
+    list.className = "golang-search-results";
+    input.parentNode.insertBefore(list, input.nextSibling);
+    input.addEventListener("input", function () {
+      var text = input.value.trim();
+      lookup(text, function (results) {
+        if (input.value.trim() !== text) {
+          return;  // outdated
+        }
+        list.innerHTML = "";
+        results.slice(0, 50).forEach(function (symbol) {
+          var item = document.createElement("li");
+          var link = document.createElement("a");
+          link.href = symbol.url;
+          link.textContent = symbol.fullname;
+          item.appendChild(link);
+          item.appendChild(document.createTextNode(" (" + symbol.objtype + ")"));
+          list.appendChild(item);
+        });
+      });
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    Array.prototype.forEach.call(
+      document.querySelectorAll("input.golang-search"), attach);
+  });
+
+  return {
+    lookup: lookup,
+    setManifest: function (value) { manifest = value; },
+    setShard: function (key, rows) { shards[key] = decode(rows); }
+  };
+})();
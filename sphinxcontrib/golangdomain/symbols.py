@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+    sphinxcontrib.golangdomain.symbols
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Streaming reader for JSON dumps of Go symbols.
+
+    A dump is a sequence of JSON objects, either one per line, simply
+    concatenated or wrapped in a top-level array, each looking like::
+
+        {"kind": "func", "package": "github.com/acme/foo", "name": "NewFoo",
+         "signature": "func NewFoo(size int) *Foo", "doc": "NewFoo ..."}
+
+    ``kind`` is one of ``package``, ``func``, ``method``, ``type``, ``var``
+    and ``const``; packages may carry a ``synopsis`` and other records the
+    Go source of their declaration as ``decl``.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import json
+import re
+import textwrap
+
+from docutils import nodes
+
+
+# record kinds to the objtypes of the directives they stand for
+kinds = {
+    "package": "package",
+    "func": "function",
+    "function": "function",
+    "method": "method",
+    "type": "type",
+    "var": "var",
+    "const": "const",
+}
+
+# whitespace and the punctuation of a top-level array between records
+separator_re = re.compile(r"[\s\[\],]*")
+paragraph_re = re.compile(r"\n\s*\n")
+
+
+def iter_records(f, chunk_size=1 << 16):
+    """Yield the JSON objects read from the file object *f* one at a time.
+
+    Only *chunk_size* characters plus the record being decoded are held in
+    memory, however large the dump is.  A malformed record raises a
+    ValueError telling its number, counting from 1.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    count = 0
+    while True:
+        chunk = f.read(chunk_size)
+        buf += chunk
+        pos = 0
+        while True:
+            pos = separator_re.match(buf, pos).end()
+            if pos == len(buf):
+                break
+            try:
+                record, pos = decoder.raw_decode(buf, pos)
+            except ValueError as exc:
+                if not chunk:
+                    # the position is in buf, not in the file
+                    msg = getattr(exc, "msg", exc)
+                    raise ValueError("record %d: %s" % (count + 1, msg))
+                # the record continues in the next chunk
+                break
+            count += 1
+            yield record
+        buf = buf[pos:]
+        if not chunk:
+            return
+
+
+def doc_to_nodes(doc):
+    """Convert a Go doc comment to paragraphs and literal blocks.
+
+    As in godoc, indented paragraphs are preformatted text.
+    """
+    result = []
+    for block in paragraph_re.split(doc.strip("\n")):
+        if block[:1] in (" ", "\t"):
+            text = textwrap.dedent(block)
+            result.append(nodes.literal_block(text, text))
+        elif block.strip():
+            text = " ".join(block.split())
+            result.append(nodes.paragraph(text, text))
+    return result
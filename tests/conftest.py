@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+    Fixtures building small Sphinx projects using the Go domain.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import io
+import textwrap
+
+import pytest
+
+from sphinx.testing.util import SphinxTestApp
+from sphinx.util.console import strip_escape_sequences
+
+
+class Project(object):
+    """
+    A Sphinx project in a temporary directory, built again and again in
+    the same build directory, so builds after the first are incremental.
+    """
+
+    def __init__(self, srcdir):
+        self.srcdir = srcdir
+        self.builddir = srcdir / "_build"
+        self.write("conf.py", 'extensions = ["sphinxcontrib.golangdomain"]\n')
+
+    def write(self, filename, text):
+        path = self.srcdir / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(text), encoding="utf-8")
+        return path
+
+    def build(self, buildername="html", **confoverrides):
+        """Build the project and return the application, whose
+        ``warnings`` are the lines of warnings of the build.
+        """
+        warning = io.StringIO()
+        app = SphinxTestApp(
+            buildername,
+            srcdir=self.srcdir,
+            builddir=self.builddir,
+            confoverrides=confoverrides,
+            status=io.StringIO(),
+            warning=warning,
+        )
+        try:
+            app.build()
+        finally:
+            app.cleanup()
+        app.warnings = strip_escape_sequences(warning.getvalue()).splitlines()
+        return app
+
+    def read_output(self, docname, buildername="html", suffix=".html"):
+        path = self.builddir / buildername / (docname + suffix)
+        return path.read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def project(tmp_path):
+    return Project(tmp_path / "src")
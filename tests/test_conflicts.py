@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the Go objects and packages described more than once.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import re
+
+from sphinxcontrib.golangdomain import migrate_data
+
+
+def write_index(project, *docnames):
+    project.write(
+        "index.rst",
+        "Index\n=====\n\n.. toctree::\n\n%s\n"
+        % "\n".join("   " + docname for docname in docnames),
+    )
+
+
+def write_package(project, docname, synopsis, body=""):
+    project.write(
+        docname + ".rst",
+        """
+        %s
+        ====
+
+        .. go:package:: io
+           :synopsis: %s
+
+        %s
+        """
+        % (docname, synopsis, body),
+    )
+
+
+def conflict_warnings(app):
+    return [line for line in app.warnings if "described more than once" in line]
+
+
+def package_links(html):
+    return re.findall(r'class="reference internal" href="([^"]*#package-io)"', html)
+
+
+def test_duplicate_package(project):
+    write_index(project, "a", "b", "main")
+    write_package(project, "a", "Package io of a.")
+    write_package(project, "b", "Package io of b.")
+    project.write("main.rst", "main\n====\n\nSee :go:pkg:`io`.\n")
+    app = project.build()
+    warnings = conflict_warnings(app)
+    assert len(warnings) == 1
+    assert "1 Golang objects described more than once" in warnings[0]
+    report = app.warnings[app.warnings.index(warnings[0]) + 1]
+    assert re.search(r"io: .*a\.rst:5 \(package\), .*b\.rst:5 \(package\)", report)
+    assert re.search(r"using .*a\.rst:5\b", report)
+    assert package_links(project.read_output("main")) == ["a.html#package-io"]
+
+
+def test_duplicate_package_taken_over(project):
+    write_index(project, "a", "b", "main")
+    write_package(project, "a", "Package io of a.")
+    write_package(project, "b", "Package io of b.")
+    project.write("main.rst", "main\n====\n\nSee :go:pkg:`io`.\n")
+    project.build()
+
+    # the package of b is stored, with its synopsis, once a drops it
+    project.write("a.rst", "a\n====\n\nNo package.\n")
+    app = project.build()
+    assert conflict_warnings(app) == []
+    assert package_links(project.read_output("main")) == ["b.html#package-io"]
+    assert "Package io of b." in project.read_output("go-pkgindex")
+
+    write_package(project, "a", "Package io of a.")
+    app = project.build()
+    assert len(conflict_warnings(app)) == 1
+    assert package_links(project.read_output("main")) == ["a.html#package-io"]
+    assert "Package io of a." in project.read_output("go-pkgindex")
+
+
+def test_canonical_package(project):
+    write_index(project, "a", "b", "main")
+    write_package(project, "a", "Package io of a.")
+    write_package(project, "b", "Package io of b.")
+    project.write("main.rst", "main\n====\n\nSee :go:pkg:`io`.\n")
+    project.build(golang_canonical_docnames=["b"])
+    assert package_links(project.read_output("main")) == ["b.html#package-io"]
+    assert "Package io of b." in project.read_output("go-pkgindex")
+
+
+def test_many_duplicates(project):
+    docnames = ["doc%02d" % i for i in range(20)]
+    write_index(project, *docnames)
+    for docname in docnames:
+        write_package(project, docname, docname, ".. go:function:: Copy()")
+    app = project.build()
+    warnings = conflict_warnings(app)
+    assert len(warnings) == 1
+    assert "2 Golang objects described more than once" in warnings[0]
+    start = app.warnings.index(warnings[0]) + 1
+    reports = app.warnings[start : start + 2]
+    assert reports[0].count("(package)") == 20
+    assert reports[0].endswith("doc00.rst:5")
+    assert reports[1].count("(function)") == 20
+
+
+def test_migrate_conflicts():
+    data = {
+        "version": 7,
+        "objects": {},
+        "functions": {"io.Copy": 0 << 4, "v1.io.Copy": 1 << 4},
+        "methods": {},
+        "packages": {},
+        "documents": ["a", "b"],
+        "docentries": {},
+        "conflicts": {
+            "io.Copy": [
+                (0, "function", 5, None),
+                (1, "function", 7, None),
+                (0, "function", 9, "v1"),
+                (1, "function", 3, "v1"),
+            ]
+        },
+    }
+    migrate_data(data)
+    assert data["version"] == 8
+    assert data["conflicts"] == {
+        "io.Copy": {
+            None: [(0, "function", 5), (1, "function", 7)],
+            "v1": [(0, "function", 9), (1, "function", 3)],
+        }
+    }
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the report of unresolved Go references of nitpicky builds.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import pickle
+
+
+def missing_warnings(app):
+    return [line for line in app.warnings if "unresolved Go references" in line]
+
+
+def test_report(project):
+    project.write(
+        "index.rst",
+        """
+        Index
+        =====
+
+        See :go:func:`Copy`, :go:func:`Copy` and :go:type:`C.int`.
+        """,
+    )
+    app = project.build(nitpicky=True, golang_nitpick_ignore=["C.*"])
+    warnings = missing_warnings(app)
+    assert len(warnings) == 1
+    assert "2 unresolved Go references to 1 targets" in warnings[0]
+    report = app.warnings[app.warnings.index(warnings[0]) + 1]
+    assert report.strip().startswith("go:func:Copy (2): ")
+    assert "C.int" not in "\n".join(app.warnings)
+
+
+def test_fixed_reference(project):
+    project.write(
+        "index.rst",
+        """
+        Index
+        =====
+
+        See :go:func:`Copy`.
+        """,
+    )
+    app = project.build(nitpicky=True)
+    assert len(missing_warnings(app)) == 1
+
+    # the missed references are not kept with the environment
+    with (project.builddir / "doctrees" / "environment.pickle").open("rb") as f:
+        assert not hasattr(pickle.load(f), "golang_missing")
+
+    project.write(
+        "index.rst",
+        """
+        Index
+        =====
+
+        .. go:function:: func Copy()
+
+        See :go:func:`Copy`.
+        """,
+    )
+    app = project.build(nitpicky=True)
+    assert missing_warnings(app) == []
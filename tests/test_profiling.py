@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the profile of the work of the Go domain.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import json
+import pickle
+
+
+def read_profile(project):
+    return json.loads(project.read_output("golang-profile", suffix=".json"))
+
+
+def test_profile_per_build(project):
+    project.write(
+        "index.rst",
+        """
+        Index
+        =====
+
+        .. go:function:: func Copy()
+        .. go:function:: func ReadAll()
+
+        See :go:func:`Copy` and :go:func:`Missing`.
+        """,
+    )
+    project.build(golang_profile=True)
+    profile = read_profile(project)
+    assert profile["timers"]["handle_signature"]["calls"] == 2
+    assert profile["counters"] == {"resolve_xref hits": 1, "resolve_xref misses": 1}
+
+    # the profile is not kept with the environment
+    with (project.builddir / "doctrees" / "environment.pickle").open("rb") as f:
+        assert not hasattr(pickle.load(f), "golang_profile")
+
+    # nor carried over to the next build, which only reads what changed
+    project.write("other.rst", ":orphan:\n\nSee :go:func:`Copy`.\n")
+    project.build(golang_profile=True)
+    profile = read_profile(project)
+    assert "handle_signature" not in profile["timers"]
+    assert profile["counters"] == {"resolve_xref hits": 1}
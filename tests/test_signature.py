@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the parser for Go function signatures.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import pytest
+
+from sphinxcontrib.golangdomain.signature import (
+    FuncSignature,
+    Param,
+    SignatureError,
+    SignatureParser,
+    parse_function,
+)
+
+
+def test_plain_function():
+    assert parse_function(
+        "func Copy(dst Writer, src Reader) (written int64, err error)"
+    ) == (
+        FuncSignature(
+            None,
+            "Copy",
+            (),
+            (Param(("dst",), "Writer"), Param(("src",), "Reader")),
+            (Param(("written",), "int64"), Param(("err",), "error")),
+        )
+    )
+
+
+def test_method():
+    func = parse_function("func (b *Buffer) Len() int")
+    assert func.receiver == Param(("b",), "*Buffer")
+    assert func.name == "Len"
+    assert func.params == ()
+    assert func.results == (Param((), "int"),)
+
+
+def test_unnamed_receiver():
+    assert parse_function("func (*Buffer) Reset()").receiver == Param((), "*Buffer")
+
+
+def test_generics():
+    func = parse_function("func Map[K comparable, V any](m map[K]V, f func(K) V) []V")
+    assert func.type_params == (Param(("K",), "comparable"), Param(("V",), "any"))
+    assert func.params == (Param(("m",), "map[K]V"), Param(("f",), "func(K) V"))
+    assert func.results == (Param((), "[]V"),)
+
+
+def test_generic_receiver():
+    func = parse_function("func (l *List[K, V]) Get(key K) (V, bool)")
+    assert func.receiver == Param(("l",), "*List[K, V]")
+    assert func.results == (Param((), "V"), Param((), "bool"))
+
+
+def test_func_typed_params():
+    func = parse_function(
+        "func Walk(root string, fn func(path string, err error) error) error"
+    )
+    assert func.params == (
+        Param(("root",), "string"),
+        Param(("fn",), "func(path string, err error) error"),
+    )
+    func = parse_function("func Do(f func(a, b int) (int, error), g func())")
+    assert func.params == (
+        Param(("f",), "func(a, b int) (int, error)"),
+        Param(("g",), "func()"),
+    )
+
+
+def test_func_typed_results():
+    func = parse_function("func Handler() func(w Writer, r *Request)")
+    assert func.results == (Param((), "func(w Writer, r *Request)"),)
+
+
+def test_variadic():
+    func = parse_function("func Printf(format string, a ...any) (n int, err error)")
+    assert func.params == (Param(("format",), "string"), Param(("a",), "...any"))
+    func = parse_function("func Join(...[]byte)")
+    assert func.params == (Param((), "...[]byte"),)
+
+
+def test_unnamed_params():
+    func = parse_function("func Index([]byte, byte) int")
+    assert func.params == (Param((), "[]byte"), Param((), "byte"))
+    func = parse_function("func Send(chan int, <-chan error, map[string]int)")
+    assert func.params == (
+        Param((), "chan int"),
+        Param((), "<-chan error"),
+        Param((), "map[string]int"),
+    )
+    # the types a and b rather than the names of a missing type
+    assert parse_function("func F(a, b)").params == (Param((), "a"), Param((), "b"))
+
+
+def test_grouped_params():
+    func = parse_function("func Max(a, b int, c float64) (x, y int)")
+    assert func.params == (Param(("a", "b"), "int"), Param(("c",), "float64"))
+    assert func.results == (Param(("x", "y"), "int"),)
+
+
+def test_trailing_comma():
+    assert parse_function("func F(a int,)").params == (Param(("a",), "int"),)
+
+
+def test_interface_and_struct_types():
+    func = parse_function("func Println(a ...interface{}) struct{}")
+    assert func.params == (Param(("a",), "...interface{}"),)
+    assert func.results == (Param((), "struct{}"),)
+    func = parse_function('func F(x struct{ A int `json:"a,b"` }) interface{ M() }')
+    assert func.params == (Param(("x",), 'struct{ A int `json:"a,b"` }'),)
+    assert func.results == (Param((), "interface{ M() }"),)
+
+
+@pytest.mark.parametrize(
+    "sig, message",
+    [
+        ("Copy(dst Writer)", "expected 'func'"),
+        ("func (a, b T) M()", "expected a single receiver"),
+        ("func (a T, b T) M()", "expected a single receiver"),
+        ("func F(a int, string)", "mixed named and unnamed parameters"),
+        ("func F(a int", "unbalanced brackets"),
+        ("func F(a func(x int)", "unbalanced brackets"),
+        ("func F(a int))", "expected a type"),
+        ("func F(a int) (b int) c", "unexpected 'c'"),
+        ("func F(a, , b int)", "expected a type"),
+        ("func F(s struct{ `a)", "unterminated string"),
+        ("func (T)", "expected a name"),
+    ],
+)
+def test_malformed(sig, message):
+    with pytest.raises(SignatureError) as excinfo:
+        parse_function(sig)
+    assert message in str(excinfo.value)
+    assert repr(sig) in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    "sig",
+    [
+        "func Copy(dst Writer, src Reader) (written int64, err error)",
+        "func (b *Buffer) Len() int",
+        "func Map[K comparable, V any](m map[K]V) []V",
+        "func Do(f func(a, b int) (int, error), g func())",
+        "func Do(f func(g func(a, b int)))",
+        "func Printf(format string, a ...any)",
+        "func Max(a, b int, c float64) (x, y int)",
+        "func F(m Map[K, V]) Map[K, V]",
+        "func F(a [2]int, b [n]T) [2]byte",
+        "func F() (a int) b",
+        "func F(a int, string)",
+        "func F(a func(x int)",
+    ],
+)
+def test_fast_path_agrees_with_parser(sig):
+    def parse(parse_function, sig):
+        try:
+            return parse_function(sig)
+        except SignatureError as exc:
+            return str(exc)
+
+    assert parse(parse_function, sig) == parse(
+        lambda sig: SignatureParser(sig).parse_function(), sig
+    )
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the scanner of Go sources and its cache.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import os
+import textwrap
+
+from sphinxcontrib.golangdomain import source
+from sphinxcontrib.golangdomain.source import (
+    SourceCache,
+    func_signatures,
+    package_records,
+    scan_files,
+    scan_source,
+)
+
+
+def scan(text):
+    return scan_source(textwrap.dedent(text))
+
+
+def decls_by_name(result):
+    return dict((decl["name"], decl) for decl in result["decls"])
+
+
+def test_grouped_declarations():
+    result = scan(
+        """
+        package io
+
+        // Seek whence values.
+        const (
+            // SeekStart means relative to the origin of the file.
+            SeekStart = 0
+            SeekCurrent, SeekEnd = 1, 2
+            seekUnexported = 3
+        )
+
+        var (
+            // EOF is the error returned by Read when no more input is available.
+            EOF = errors.New("EOF")
+        )
+
+        type (
+            // Reader is the interface that wraps the basic Read method.
+            Reader interface {
+                Read(p []byte) (n int, err error)
+            }
+            Writer interface{ Write(p []byte) (n int, err error) }
+        )
+        """
+    )
+    assert result["package"] == "io"
+    assert [(decl["kind"], decl["name"]) for decl in result["decls"]] == [
+        ("const", "SeekStart"),
+        ("const", "SeekCurrent"),
+        ("const", "SeekEnd"),
+        ("var", "EOF"),
+        ("type", "Reader"),
+        ("type", "Writer"),
+    ]
+    decls = decls_by_name(result)
+    assert decls["SeekStart"]["doc"] == (
+        "SeekStart means relative to the origin of the file."
+    )
+    assert decls["SeekStart"]["decl"] == "const SeekStart = 0"
+    assert decls["SeekEnd"]["doc"] == ""
+    assert decls["EOF"]["decl"] == 'var EOF = errors.New("EOF")'
+    assert decls["Reader"]["decl"] == (
+        "type Reader interface {\n    Read(p []byte) (n int, err error)\n}"
+    )
+
+
+def test_generic_type_params_over_lines():
+    decls = decls_by_name(
+        scan(
+            """
+            package maps
+
+            // Map maps keys to values.
+            type Map[
+                K comparable,
+                V any,
+            ] struct {
+                m map[K]V
+            }
+
+            type Set[T comparable] map[T]struct{}
+            """
+        )
+    )
+    assert decls["Map"]["signature"] == "Map[K comparable, V any]"
+    assert decls["Map"]["doc"] == "Map maps keys to values."
+    assert decls["Set"]["signature"] == "Set[T comparable]"
+
+
+def test_interface_and_struct_results():
+    text = textwrap.dedent(
+        """
+        package fmt
+
+        func Values() interface{} {
+            return nil
+        }
+
+        func Empty() struct{} { return struct{}{} }
+
+        func (p *pp) Arg(
+            i int,
+            verb rune,
+        ) interface{ String() string } {
+            return nil
+        }
+        """
+    )
+    assert list(func_signatures(text)) == [
+        "func Values() interface{}",
+        "func Empty() struct{}",
+        "func (p *pp) Arg(i int, verb rune) interface{ String() string }",
+    ]
+    decls = decls_by_name(scan_source(text))
+    assert decls["Values"]["signature"] == "func Values() interface{}"
+    # methods of unexported types are left out
+    assert "Arg" not in decls
+
+
+def test_directive_comments():
+    result = scan(
+        """
+        //go:build linux
+
+        // Package sys is about the system.
+        package sys
+
+        // Call calls the system.
+        //
+        //go:noinline
+        //go:linkname call runtime.call
+        func Call(trap uintptr) (r uintptr) {
+            return 0
+        }
+
+        //go:generate stringer -type=Mode
+        //export Mode
+        type Mode int
+        """
+    )
+    assert result["doc"] == "Package sys is about the system."
+    decls = decls_by_name(result)
+    assert decls["Call"]["doc"] == "Call calls the system."
+    assert decls["Mode"]["doc"] == ""
+
+
+def test_package_records():
+    results = [
+        scan(
+            """
+            // Package io provides basic interfaces to I/O primitives. It
+            // wraps them.
+            package io
+
+            type Writer interface{}
+
+            func (w Writer) Write() {}
+
+            func Copy() {}
+
+            const SeekStart = 0
+            """
+        ),
+        scan(
+            """
+            //go:build ignore
+
+            // The generator of the tables.
+            package main
+
+            func Generate() {}
+            """
+        ),
+        scan(
+            """
+            package io
+
+            var EOF error
+
+            type Reader interface{}
+            """
+        ),
+    ]
+    records = package_records(results, "example.com/io")
+    assert records[0] == {
+        "kind": "package",
+        "name": "example.com/io",
+        "synopsis": "Package io provides basic interfaces to I/O primitives",
+        "doc": "Package io provides basic interfaces to I/O primitives. It\n"
+        "wraps them.",
+    }
+    # the generator of another package is left out
+    assert [(record["kind"], record["name"]) for record in records[1:]] == [
+        ("const", "SeekStart"),
+        ("var", "EOF"),
+        ("func", "Copy"),
+        ("type", "Reader"),
+        ("type", "Writer"),
+        ("method", "Write"),
+    ]
+    assert all(record["package"] == "example.com/io" for record in records[1:])
+
+
+def test_cache(tmp_path, monkeypatch):
+    filename = tmp_path / "io.go"
+    filename.write_text("package io\n\nfunc Copy() {}\n", encoding="utf-8")
+    cachedir = str(tmp_path / "cache")
+    calls = []
+
+    def counting_scan_source(text):
+        calls.append(text)
+        return scan_source(text)
+
+    monkeypatch.setattr(source, "scan_source", counting_scan_source)
+    result = scan_files([str(filename)], cachedir)[0]
+    assert [decl["name"] for decl in result["decls"]] == ["Copy"]
+    assert len(calls) == 1
+
+    # reused while the mtime and size are unchanged
+    assert SourceCache(cachedir).scan(str(filename)) == result
+    assert len(calls) == 1
+
+    # reused without rescanning when only the mtime changed
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert SourceCache(cachedir).scan(str(filename)) == result
+    assert len(calls) == 1
+
+    # rescanned when the content changed
+    filename.write_text("package io\n\nfunc Pipe() {}\n", encoding="utf-8")
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    result = SourceCache(cachedir).scan(str(filename))
+    assert [decl["name"] for decl in result["decls"]] == ["Pipe"]
+    assert len(calls) == 2
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the go:symbols directive and its reader of JSON dumps.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import io
+
+import pytest
+
+from sphinxcontrib.golangdomain.symbols import iter_records
+
+
+PACKAGE = '{"kind": "package", "name": "foo", "synopsis": "Package foo."}'
+FUNC = (
+    '{"kind": "func", "package": "foo", "name": "NewFoo",'
+    ' "signature": "func NewFoo(size int) *Foo", "doc": "NewFoo makes a Foo."}'
+)
+TYPE = '{"kind": "type", "package": "foo", "name": "Foo", "doc": "Foo is a foo."}'
+
+
+def build_symbols(project, dump):
+    project.write("symbols.json", dump)
+    project.write(
+        "index.rst",
+        """
+        Symbols
+        =======
+
+        .. go:symbols:: symbols.json
+        """,
+    )
+    return project.build()
+
+
+def record_warnings(app):
+    return [line for line in app.warnings if "Go symbol" in line]
+
+
+def test_iter_records():
+    dump = "[%s,\n%s]\n%s" % (PACKAGE, FUNC, TYPE)
+    records = list(iter_records(io.StringIO(dump), chunk_size=7))
+    assert [record["name"] for record in records] == ["foo", "NewFoo", "Foo"]
+
+
+def test_iter_records_malformed():
+    records = iter_records(io.StringIO("%s\n%s\n{oops" % (PACKAGE, FUNC)))
+    assert next(records)["name"] == "foo"
+    assert next(records)["name"] == "NewFoo"
+    with pytest.raises(ValueError, match="record 3"):
+        next(records)
+
+
+def test_symbols(project):
+    app = build_symbols(project, "\n".join([PACKAGE, FUNC, TYPE]))
+    assert record_warnings(app) == []
+    html = project.read_output("index")
+    assert 'id="foo.NewFoo"' in html
+    assert 'id="foo.Foo"' in html
+    assert "NewFoo makes a Foo." in html
+
+
+def test_non_object_record(project):
+    app = build_symbols(project, '["oops"]')
+    warnings = record_warnings(app)
+    assert len(warnings) == 1
+    assert "invalid Go symbol record 1: 'oops'" in warnings[0]
+
+
+def test_mixed_records(project):
+    dump = '[%s, "oops", 1, %s, {"kind": "func"}, null, %s]' % (PACKAGE, FUNC, TYPE)
+    app = build_symbols(project, dump)
+    warnings = record_warnings(app)
+    assert len(warnings) == 4
+    assert "invalid Go symbol record 2: 'oops'" in warnings[0]
+    assert "invalid Go symbol record 3: 1" in warnings[1]
+    assert "invalid Go symbol record 5: {'kind': 'func'}" in warnings[2]
+    assert "invalid Go symbol record 6: None" in warnings[3]
+    html = project.read_output("index")
+    assert 'id="foo.NewFoo"' in html
+    assert 'id="foo.Foo"' in html
+
+
+def test_malformed_record_keeps_those_read(project):
+    app = build_symbols(project, "%s\n%s\n{oops" % (PACKAGE, FUNC))
+    warnings = record_warnings(app)
+    assert len(warnings) == 1
+    assert "Error reading Go symbols" in warnings[0]
+    assert "record 3" in warnings[0]
+    assert 'id="foo.NewFoo"' in project.read_output("index")
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests of the resolution of Go references.
+
+    :copyright: Copyright 2012 by Yoshifumi YAMAGUCHI
+    :license: BSD, see LICENSE for details.
+"""
+
+import re
+
+
+def write_readers(project):
+    project.write(
+        "index.rst",
+        """
+        Readers
+        =======
+
+        .. toctree::
+
+           bufio
+           io
+           main
+        """,
+    )
+    for pkgname in ("bufio", "io"):
+        project.write(
+            pkgname + ".rst",
+            """
+            %s
+            =====
+
+            .. go:package:: %s
+
+            .. go:type:: Reader
+
+            See :go:type:`Reader`.
+            """
+            % (pkgname, pkgname),
+        )
+
+
+def links(html):
+    return re.findall(r'class="reference internal" href="([^"]*#[^"]*Reader)"', html)
+
+
+def ambiguity_warnings(app):
+    return [line for line in app.warnings if "more than one target found" in line]
+
+
+def test_bare_name_prefers_current_package(project):
+    write_readers(project)
+    project.write(
+        "main.rst",
+        """
+        main
+        ====
+
+        .. go:package:: main
+        """,
+    )
+    app = project.build()
+    assert ambiguity_warnings(app) == []
+    assert links(project.read_output("bufio")) == ["#bufio.Reader"]
+    assert links(project.read_output("io")) == ["#io.Reader"]
+
+
+def test_ambiguous_bare_name_warns(project):
+    write_readers(project)
+    project.write(
+        "main.rst",
+        """
+        main
+        ====
+
+        .. go:package:: main
+
+        See :go:type:`Reader`.
+        """,
+    )
+    app = project.build()
+    warnings = ambiguity_warnings(app)
+    assert len(warnings) == 1
+    assert "main.rst" in warnings[0]
+    assert "'Reader': bufio.Reader, io.Reader" in warnings[0]
+
+
+def test_qualified_name_is_not_ambiguous(project):
+    write_readers(project)
+    project.write(
+        "main.rst",
+        """
+        main
+        ====
+
+        .. go:package:: main
+
+        See :go:type:`io.Reader`.
+        """,
+    )
+    app = project.build()
+    assert ambiguity_warnings(app) == []
+    assert links(project.read_output("main")) == ["io.html#io.Reader"]
+
+
+def test_bare_member_name_prefers_current_package(project):
+    for pkgname in ("bufio", "io"):
+        project.write(
+            pkgname + ".rst",
+            """
+            %s
+            =====
+
+            .. go:package:: %s
+
+            .. go:type:: Reader
+
+               .. go:field:: Size int
+
+            See :go:field:`Size`.
+            """
+            % (pkgname, pkgname),
+        )
+    project.write("index.rst", "Readers\n=======\n\n.. toctree::\n\n   bufio\n   io\n")
+    app = project.build()
+    assert ambiguity_warnings(app) == []
+    html = project.read_output("io")
+    assert re.findall(r'class="reference internal" href="([^"]*Size)"', html) == [
+        "#io.Reader.Size"
+    ]